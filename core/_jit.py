@@ -0,0 +1,24 @@
+"""
+Optional Numba support shared by the compiled kernels.
+Without Numba, njit leaves functions as plain Python and prange is range.
+"""
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:  # Numba is optional, fall back to plain Python
+    HAVE_NUMBA = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+def disk_cache(module_name: str) -> bool:
+    """
+    Whether kernels defined in a module may use Numba's disk cache.
+    Cache entries record the importable module name, so a cache written by
+    an import cannot be loaded when the module runs as a script.
+    """
+    return module_name != '__main__'
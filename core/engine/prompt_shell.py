@@ -5,11 +5,28 @@ Each prompt is a living container that evolves through use, like TikTok sounds.
 
 import uuid
 import time
-from typing import Optional, List, Dict, Any
-from dataclasses import dataclass, field
+import math
+import re
+import string
+import numpy as np
+from typing import Optional, List, Dict, Any, Tuple
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 
-@dataclass
+# Trending score loses 5% per day of inactivity
+TRENDING_DECAY_SECONDS = 86400 / -math.log(0.95)
+
+# Most recent executions kept per shell, one float32 row each
+HIST_CAP = 256
+HISTORY_FIELDS = (
+    'completion_time', 'user_satisfaction', 'objective_success',
+    'cognitive_load', 'interaction_depth'
+)
+
+# Words that signal a response is harder to follow
+_COMPLEX_RE = re.compile(r'however|although|considering|alternatively')
+
+@dataclass(slots=True, frozen=True)
 class ExecutionMetrics:
     """Track what makes prompts effective"""
     completion_time: float = 0.0
@@ -28,61 +45,140 @@ class ExecutionMetrics:
             0.1 * (1.0 - min(self.completion_time / 30.0, 1.0))
         )
 
+class HyperLogLog:
+    """
+    Fixed-size cardinality sketch for counting unique users.
+    2**p one-byte registers, allocated on the first add.
+    """
+    
+    # 2**-rank for every possible register value
+    _INV_POW2 = [2.0 ** -rank for rank in range(65)]
+    
+    # Mixed into hash() so the register index doesn't follow raw string hashes;
+    # str hashes are salted per process, which is fine for an in-memory sketch
+    _SALT = 0x9E3779B97F4A7C15
+    _MASK64 = (1 << 64) - 1
+    
+    def __init__(self, p: int = 12):
+        self.p = p
+        self.registers: Optional[bytearray] = None  # Standard error ~1.04 / sqrt(2**p)
+        
+        # Harmonic sum and empty register count, kept current by add()
+        self._inv_sum = float(1 << p)
+        self._zeros = 1 << p
+        
+    def add(self, item: str):
+        """Record an item; duplicates never grow the sketch"""
+        if self.registers is None:
+            self.registers = bytearray(1 << self.p)
+        x = hash((item, self._SALT)) & self._MASK64
+        index = x >> (64 - self.p)
+        rest = x & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        old = self.registers[index]
+        if rank > old:
+            self.registers[index] = rank
+            self._inv_sum += self._INV_POW2[rank] - self._INV_POW2[old]
+            if not old:
+                self._zeros -= 1
+            
+    def __len__(self) -> int:
+        """Estimated number of distinct items added"""
+        if self.registers is None:
+            return 0
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / self._inv_sum
+        
+        # Linear counting is more accurate for small cardinalities
+        zeros = self._zeros
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+            
+        return int(round(estimate))
+
 class PromptShell:
     """
     Core prompt container that improves through collective use.
     Embeds viral mechanics without surface complexity.
     """
     
+    # Fixed attribute layout, no per-instance __dict__
+    __slots__ = (
+        'id', 'creator_id', '_template', '_parsed', 'parent_id', 'children',
+        'usage_count', 'unique_users', 'effectiveness_score',
+        'created_at_ts', 'created_at', 'last_used_at_ts', 'expiry_time',
+        'version', 'mutations', '_hist', '_hist_idx', '_hist_n',
+        'remix_count', 'share_count', 'trending_score', 'viral_coefficient',
+        '_last_trend_update', 'total_earned', 'royalty_rate'
+    )
+    
     def __init__(self, creator_id: str, template: str = "", parent_id: Optional[str] = None):
         self.id = str(uuid.uuid4())
         self.creator_id = creator_id
-        self.template = template
+        self.template = template  # Parsed by the setter
         self.parent_id = parent_id
         self.children: List[str] = []
         
         # Usage tracking
         self.usage_count = 0
-        self.unique_users = set()
+        self.unique_users = HyperLogLog()  # Constant memory at any scale
         self.effectiveness_score = 0.5  # Start neutral
         
         # Temporal mechanics
-        self.created_at = datetime.utcnow()
-        self.last_used_at = None
+        self.created_at_ts = time.time()  # Epoch seconds for arithmetic
+        self.created_at = datetime.utcfromtimestamp(self.created_at_ts)  # For display
+        self.last_used_at_ts: Optional[float] = None
         self.expiry_time = None  # For time-limited prompts
         
         # Evolution tracking
         self.version = 1
         self.mutations: List[Dict[str, Any]] = []
-        self.execution_history: List[ExecutionMetrics] = []
+        
+        # Ring buffer of recent ExecutionMetrics, columns = HISTORY_FIELDS,
+        # allocated on the first execution
+        self._hist: Optional[np.ndarray] = None
+        self._hist_idx = 0
+        self._hist_n = 0
         
         # Viral mechanics
         self.remix_count = 0
         self.share_count = 0
         self.trending_score = 0.0
         self.viral_coefficient = 0.0
+        self._last_trend_update = self.created_at_ts
         
         # Revenue tracking
         self.total_earned = 0.0
         self.royalty_rate = 0.7  # Creator gets 70%
         
+    @property
+    def template(self) -> str:
+        return self._template
+    
+    @template.setter
+    def template(self, template: str):
+        """Replace the template and re-parse it, so _render never sees a stale parse"""
+        self._template = template
+        self._parsed = self._parse_template(template)
+        
     def execute(self, context: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         """
         Execute prompt with context, tracking all metrics.
         Each use makes the prompt smarter.
         """
-        start_time = time.time()
+        now = time.time()
         
         # Track unique users
         self.unique_users.add(user_id)
         self.usage_count += 1
-        self.last_used_at = datetime.utcnow()
+        self.last_used_at_ts = now
         
         # Execute against AI provider
         result = self._execute_prompt(context)
         
         # Calculate metrics
-        execution_time = time.time() - start_time
+        execution_time = time.time() - now
         metrics = ExecutionMetrics(
             completion_time=execution_time,
             user_satisfaction=result.get('satisfaction', 0.5),
@@ -92,11 +188,12 @@ class PromptShell:
         )
         
         # Update effectiveness
-        self.execution_history.append(metrics)
-        self._update_effectiveness_score(metrics)
+        self._record_history(metrics)
+        effectiveness = metrics.calculate_effectiveness()
+        self._update_effectiveness_score(effectiveness)
         
         # Check for viral potential
-        self._update_viral_metrics(metrics)
+        self._update_viral_metrics(metrics, effectiveness, now)
         
         return {
             'result': result,
@@ -134,13 +231,13 @@ class PromptShell:
         Temporary exclusive access to high-performing prompts.
         """
         lease_price = self._calculate_lease_price(duration_hours)
-        expiry = datetime.utcnow() + timedelta(hours=duration_hours)
+        start_time = datetime.utcnow()
         
         lease = {
             'prompt_id': self.id,
             'lessee_id': lessee_id,
-            'start_time': datetime.utcnow(),
-            'expiry_time': expiry,
+            'start_time': start_time,
+            'expiry_time': start_time + timedelta(hours=duration_hours),
             'price': lease_price,
             'creator_earnings': lease_price * self.royalty_rate
         }
@@ -157,7 +254,7 @@ class PromptShell:
         """
         # This would integrate with AI providers
         # Simplified for architecture demonstration
-        filled_template = self.template.format(**context)
+        filled_template = self._render(context)
         
         # Simulate execution
         return {
@@ -167,13 +264,70 @@ class PromptShell:
             'turns': 2
         }
     
-    def _update_effectiveness_score(self, metrics: ExecutionMetrics):
+    def recent_metrics(self) -> np.ndarray:
+        """
+        Most recent executions, oldest first.
+        One row per execution, columns ordered as HISTORY_FIELDS.
+        """
+        if self._hist is None:
+            return np.zeros((0, len(HISTORY_FIELDS)), dtype=np.float32)
+        if self._hist_n < HIST_CAP:
+            return self._hist[:self._hist_n].copy()
+        return np.roll(self._hist, -self._hist_idx, axis=0)
+    
+    def _record_history(self, metrics: ExecutionMetrics):
+        """
+        Store metrics in the ring buffer.
+        Memory stays bounded no matter how often the prompt runs.
+        """
+        if self._hist is None:
+            self._hist = np.zeros((HIST_CAP, len(HISTORY_FIELDS)), dtype=np.float32)
+        self._hist[self._hist_idx] = (
+            metrics.completion_time,
+            metrics.user_satisfaction,
+            metrics.objective_success,
+            metrics.cognitive_load,
+            metrics.interaction_depth
+        )
+        self._hist_idx = (self._hist_idx + 1) % HIST_CAP
+        self._hist_n = min(self._hist_n + 1, HIST_CAP)
+    
+    def _parse_template(self, template: str) -> Optional[List[Tuple[str, Optional[str]]]]:
+        """
+        Split the template into (literal, field_name) pairs once.
+        None means the template needs full str.format semantics.
+        """
+        parsed = []
+        try:
+            for literal, field_name, format_spec, conversion in string.Formatter().parse(template):
+                if field_name is not None and (
+                    format_spec or conversion or not field_name.isidentifier()
+                ):
+                    return None
+                parsed.append((literal, field_name))
+        except ValueError:
+            return None  # Malformed braces, let str.format raise on execute
+            
+        return parsed
+    
+    def _render(self, context: Dict[str, Any]) -> str:
+        """
+        Fill the template from the pre-parsed pieces.
+        Equivalent to self.template.format(**context).
+        """
+        if self._parsed is None:
+            return self.template.format(**context)
+            
+        return "".join([
+            literal if field_name is None else literal + format(context[field_name])
+            for literal, field_name in self._parsed
+        ])
+    
+    def _update_effectiveness_score(self, new_score: float):
         """
         Rolling average that weights recent executions higher.
         Prompts get better through use.
         """
-        new_score = metrics.calculate_effectiveness()
-        
         # Exponential moving average
         alpha = 0.1  # Learning rate
         self.effectiveness_score = (
@@ -187,29 +341,29 @@ class PromptShell:
         Lower is better for viral spread.
         """
         # Simplified heuristic based on response complexity
-        response_length = len(result.get('response', ''))
-        complexity_indicators = ['however', 'although', 'considering', 'alternatively']
-        complexity_count = sum(1 for ind in complexity_indicators if ind in result.get('response', ''))
+        response = result.get('response', '')
+        complexity_count = len(set(_COMPLEX_RE.findall(response)))  # Distinct indicators
         
         return min(
-            (response_length / 1000) + (complexity_count * 0.1),
+            (len(response) / 1000) + (complexity_count * 0.1),
             1.0
         )
     
-    def _update_viral_metrics(self, metrics: ExecutionMetrics):
+    def _update_viral_metrics(self, metrics: ExecutionMetrics, effectiveness: float, now: float):
         """
         Calculate viral potential based on usage patterns.
         High effectiveness + low cognitive load = viral.
         """
-        if metrics.calculate_effectiveness() > 0.8:
+        if effectiveness > 0.8:
             self.trending_score += 0.1
             
         if metrics.cognitive_load < 0.3:
             self.trending_score += 0.05
             
-        # Decay trending score over time
-        time_decay = (datetime.utcnow() - self.created_at).total_seconds() / 86400
-        self.trending_score *= (0.95 ** time_decay)
+        # Decay trending score by the time since the last update
+        elapsed = now - self._last_trend_update
+        self.trending_score *= math.exp(-elapsed / TRENDING_DECAY_SECONDS)
+        self._last_trend_update = now
     
     def _calculate_lease_price(self, duration_hours: int) -> float:
         """
@@ -262,53 +416,14 @@ class PromptShell:
             'unique_users': len(self.unique_users),
             'effectiveness_score': self.effectiveness_score,
             'created_at': self.created_at.isoformat(),
-            'last_used_at': self.last_used_at.isoformat() if self.last_used_at else None,
+            'created_at_ts': self.created_at_ts,
+            'last_used_at': (
+                datetime.utcfromtimestamp(self.last_used_at_ts).isoformat()
+                if self.last_used_at_ts is not None else None
+            ),
             'version': self.version,
             'remix_count': self.remix_count,
             'viral_coefficient': self.viral_coefficient,
             'trending_score': self.trending_score,
             'total_earned': self.total_earned
         }
-
-# Example usage pattern that demonstrates virality
-if __name__ == "__main__":
-    # Creator makes original prompt
-    original = PromptShell(
-        creator_id="creator_123",
-        template="You are a {role} helping with {task}. Start by {approach}."
-    )
-    
-    # User tries it
-    result = original.execute(
-        context={
-            'role': 'startup mentor',
-            'task': 'finding product-market fit',
-            'approach': 'understanding the problem deeply'
-        },
-        user_id="user_456"
-    )
-    
-    # User loves it, creates a remix
-    remix = original.fork(
-        new_creator_id="user_456",
-        modifications={
-            'append': "Focus especially on customer pain points."
-        }
-    )
-    
-    # Remix goes viral
-    for i in range(100):
-        remix.execute(
-            context={
-                'role': 'growth advisor',
-                'task': 'scaling user acquisition',
-                'approach': 'analyzing current metrics'
-            },
-            user_id=f"user_{i}"
-        )
-    
-    # Original creator earns from derivative success
-    print(f"Original effectiveness: {original.effectiveness_score}")
-    print(f"Remix effectiveness: {remix.effectiveness_score}")
-    print(f"Original viral coefficient: {original.viral_coefficient}")
-    print(f"Creator earnings: ${original.total_earned}")
@@ -4,10 +4,120 @@ Like TikTok's FYP but for cognitive patterns.
 """
 
 import numpy as np
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
-from collections import defaultdict
+from typing import List, Dict, Any, Iterable, Mapping, Optional, Set, Tuple
+from types import MappingProxyType
+from datetime import timezone
+from collections import defaultdict, Counter
+from functools import lru_cache
+import math
 import random
+import re
+import sys
+import time
+
+from .._jit import njit, prange, disk_cache
+
+# Keyword -> category, listed in priority order
+CATEGORY_KEYWORDS = (
+    ('startup', 'business'), ('business', 'business'),
+    ('code', 'technical'), ('programming', 'technical'),
+    ('write', 'creative'), ('story', 'creative'),
+    ('analyze', 'analytical'), ('data', 'analytical')
+)
+
+# Distinct templates whose category each algorithm remembers
+CATEGORY_CACHE_SIZE = 4096
+
+# Trending scores lose 1% per recorded interaction
+TRENDING_DECAY = 0.99
+TRENDING_FLOOR = 0.01          # Scores below this are forgotten
+TRENDING_SWEEP_INTERVAL = 1024 # Interactions between eviction sweeps
+
+@njit(parallel=True, fastmath=True, cache=disk_cache(__name__))
+def _score_batch(effectiveness, novelty, affinity, creator_trust, usage_count,
+                 remix_count, unique_users, trending, age_hours, weights, boost):
+    """Compiled scoring loop over candidate columns, see _calculate_prompt_scores"""
+    n = effectiveness.shape[0]
+    scores = np.empty(n)
+    for i in prange(n):
+        # Viral potential: low friction + high value = viral
+        usage_floor = max(usage_count[i], 1.0)
+        viral_potential = (
+            0.4 * min(remix_count[i] / usage_floor * 10, 1.0) +  # Remix signal
+            0.3 * (unique_users[i] / usage_floor) +             # Stickiness
+            0.2 * trending[i] +                                 # Current momentum
+            0.1 * (1.0 if age_hours[i] < 24 else 0.8)           # Fresh content bonus
+        )
+        # Recency decays over a week
+        recency = math.exp(-age_hours[i] / 168)
+        scores[i] = boost * (
+            weights[0] * effectiveness[i] +
+            weights[1] * novelty[i] +
+            weights[2] * viral_potential +
+            weights[3] * affinity[i] +
+            weights[4] * recency +
+            weights[5] * creator_trust[i]
+        )
+    return scores
+
+# Compile once at import instead of on the first feed request
+_score_batch(*([np.ones(2)] * 9), np.ones(6), 1.0)
+
+# Seconds between refreshes of the exploration candidate pool
+EXPLORATION_POOL_TTL = 300.0
+
+# Interaction types are logged as compact uint8 codes
+INTERACTION_TYPES = ('view', 'use', 'remix', 'skip', 'share')
+INTERACTION_TYPE_IDS = {name: code for code, name in enumerate(INTERACTION_TYPES)}
+
+# Category affinity change per interaction, indexed by type code
+_AFFINITY_WEIGHTS = (0.0, 1.0, 2.0, -0.5, 0.0)
+
+# Trending momentum per interaction, indexed by type code
+_TRENDING_WEIGHTS = (0.1, 0.5, 2.0, -0.3, 1.5)
+
+class InteractionLog:
+    """
+    Append-only log of one user's interactions, stored column-wise.
+    17 bytes per event; capacity doubles as the log grows.
+    """
+    
+    def __init__(self, capacity: int = 16):
+        self.prompt_idx = np.empty(capacity, dtype=np.int64)    # Interned prompt ids
+        self.timestamps = np.empty(capacity, dtype=np.float64)  # Epoch seconds
+        self.types = np.empty(capacity, dtype=np.uint8)         # INTERACTION_TYPE_IDS
+        self.size = 0
+        
+    def __len__(self) -> int:
+        return self.size
+    
+    def append(self, prompt_idx: int, timestamp: float, type_id: int):
+        """Add one event, growing the columns when full"""
+        if self.size == len(self.timestamps):
+            self._grow()
+            
+        self.prompt_idx[self.size] = prompt_idx
+        self.timestamps[self.size] = timestamp
+        self.types[self.size] = type_id
+        self.size += 1
+        
+    def count(self, interaction_type: str) -> int:
+        """Number of logged events of one type"""
+        type_id = INTERACTION_TYPE_IDS[interaction_type]
+        return int(np.count_nonzero(self.types[:self.size] == type_id))
+    
+    def hourly_histogram(self) -> np.ndarray:
+        """Events per UTC hour of day"""
+        hours = (self.timestamps[:self.size] % 86400 // 3600).astype(np.int64)
+        return np.bincount(hours, minlength=24)
+    
+    def _grow(self):
+        capacity = 2 * len(self.timestamps)
+        for name in ('prompt_idx', 'timestamps', 'types'):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
 
 class FeedAlgorithm:
     """
@@ -16,7 +126,7 @@ class FeedAlgorithm:
     """
     
     def __init__(self):
-        self.recommendation_weights = {
+        self._recommendation_weights = {
             'effectiveness': 0.3,      # How well does it work?
             'novelty': 0.2,           # Is it different?
             'viral_potential': 0.2,    # Will it spread?
@@ -24,18 +134,29 @@ class FeedAlgorithm:
             'recency': 0.1,           # Is it fresh?
             'creator_trust': 0.05     # Is creator reliable?
         }
+        # Fixed factor order of the weights passed to _score_batch
+        self._factor_order = (
+            'effectiveness', 'novelty', 'viral_potential',
+            'user_affinity', 'recency', 'creator_trust'
+        )
+        self._weights = np.array([self._recommendation_weights[f] for f in self._factor_order])
         
         # User behavior tracking
         self.user_interactions = defaultdict(lambda: {
-            'views': [],
-            'uses': [],
-            'remixes': [],
-            'skips': [],
+            'events': InteractionLog(),
             'categories': defaultdict(float)
         })
         
-        # Global trend detection
-        self.trending_patterns = defaultdict(float)
+        # Prompt ids interned to dense ints for the interaction logs
+        self._prompt_index: Dict[str, int] = {}
+        self._prompt_ids: List[str] = []
+        
+        # Global trend detection as dense arrays: score as of its last-update tick
+        self._trend_index: Dict[str, int] = {}
+        self._trend_ids: List[str] = []
+        self._trend_scores = np.zeros(64)
+        self._trend_ticks = np.zeros(64, dtype=np.int64)
+        self._trend_tick = 0
         self.emerging_creators = set()
         self.viral_thresholds = {
             'remix_rate': 0.1,    # 10% of users remix
@@ -43,6 +164,38 @@ class FeedAlgorithm:
             'completion_rate': 0.8 # 80% complete interaction
         }
         
+        # High-quality prompts sampled for exploration, refreshed every TTL
+        self._exploration_pool: List[Dict[str, Any]] = []
+        self._exploration_pool_loaded_at = float('-inf')
+        
+        # All category keywords matched in a single scan of the lowercased
+        # template; group n + 1 is keyword n, and the lookahead lets
+        # overlapping keywords each be found
+        self._category_regex = re.compile(
+            '(?=' + '|'.join(f'({re.escape(keyword)})' for keyword, _ in CATEGORY_KEYWORDS) + ')'
+        )
+        
+        # Categories memoised by template text, so prompts are never written to
+        # and an edited template is simply categorized afresh
+        self._template_category = lru_cache(maxsize=CATEGORY_CACHE_SIZE)(self._categorize_template)
+        
+    @property
+    def recommendation_weights(self) -> Mapping[str, float]:
+        """Read-only view of the factor weights; change them with set_weights"""
+        return MappingProxyType(self._recommendation_weights)
+    
+    def set_weights(self, **weights: float):
+        """
+        Update factor weights by name.
+        Rebuilds the array the scoring kernel reads.
+        """
+        unknown = weights.keys() - self._recommendation_weights.keys()
+        if unknown:
+            raise KeyError(f"Unknown recommendation factors: {sorted(unknown)}")
+            
+        self._recommendation_weights.update(weights)
+        self._weights = np.array([self._recommendation_weights[f] for f in self._factor_order])
+        
     def get_feed(self, user_id: str, count: int = 20) -> List[Dict[str, Any]]:
         """
         Generate personalized feed for user.
@@ -54,14 +207,14 @@ class FeedAlgorithm:
         # Get candidate prompts
         candidates = self._gather_candidates(user_id, count * 5)
         
-        # Score and rank
-        scored_candidates = []
-        for prompt in candidates:
-            score = self._calculate_prompt_score(prompt, user_profile)
-            scored_candidates.append((score, prompt))
+        # Score all candidates in one batched pass
+        scores = self._calculate_prompt_scores(candidates, user_profile)
         
-        # Sort by score
-        scored_candidates.sort(key=lambda x: x[0], reverse=True)
+        # Rank everything (stable, ties keep candidate order), but build the
+        # (score, prompt) pairs lazily: the filter stops once it has enough
+        order = np.argsort(-scores, kind='stable').tolist()
+        score_values = scores.tolist()
+        scored_candidates = ((score_values[i], candidates[i]) for i in order)
         
         # Apply diversity filter
         diverse_feed = self._apply_diversity_filter(scored_candidates, count)
@@ -80,36 +233,33 @@ class FeedAlgorithm:
         Track user interactions to improve recommendations.
         Every action teaches the algorithm.
         """
-        timestamp = datetime.utcnow()
-        
-        interaction = {
-            'prompt_id': prompt_id,
-            'timestamp': timestamp,
-            'type': interaction_type,
-            'metadata': metadata
-        }
-        
-        # Update user profile
+        # Update user profile (metadata is not kept in the compact log)
         user_data = self.user_interactions[user_id]
         
-        if interaction_type == 'view':
-            user_data['views'].append(interaction)
-        elif interaction_type == 'use':
-            user_data['uses'].append(interaction)
-            self._update_category_affinities(user_id, prompt_id, weight=1.0)
-        elif interaction_type == 'remix':
-            user_data['remixes'].append(interaction)
-            self._update_category_affinities(user_id, prompt_id, weight=2.0)
-        elif interaction_type == 'skip':
-            user_data['skips'].append(interaction)
-            self._update_category_affinities(user_id, prompt_id, weight=-0.5)
+        type_id = INTERACTION_TYPE_IDS.get(interaction_type)
+        if type_id is not None:
+            user_data['events'].append(self._intern_prompt_id(prompt_id), time.time(), type_id)
+            
+            affinity_weight = _AFFINITY_WEIGHTS[type_id]
+            if affinity_weight:
+                self._update_category_affinities(user_id, prompt_id, weight=affinity_weight)
         
         # Update global patterns
-        self._update_trending_patterns(prompt_id, interaction_type)
+        self._update_trending_patterns(prompt_id, type_id)
         
         # Detect viral moments
         self._check_viral_threshold(prompt_id)
     
+    def _intern_prompt_id(self, prompt_id: str) -> int:
+        """Dense integer id for a prompt, assigned on first sight"""
+        index = self._prompt_index.get(prompt_id)
+        if index is None:
+            prompt_id = sys.intern(prompt_id)  # One shared copy across all logs
+            index = len(self._prompt_ids)
+            self._prompt_index[prompt_id] = index
+            self._prompt_ids.append(prompt_id)
+        return index
+    
     def _build_user_profile(self, user_id: str) -> Dict[str, Any]:
         """
         Build comprehensive user profile from interaction history.
@@ -128,99 +278,93 @@ class FeedAlgorithm:
         
         return profile
     
-    def _calculate_prompt_score(self, prompt: Dict[str, Any], 
-                               user_profile: Dict[str, Any]) -> float:
+    def _analyze_time_patterns(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Score prompt for specific user.
-        Balances multiple optimization objectives.
+        When is this user active?
+        Histogram of interactions by UTC hour, computed over the whole log.
         """
-        scores = {}
-        
-        # Effectiveness score
-        scores['effectiveness'] = prompt.get('effectiveness_score', 0.5)
+        hourly_activity = user_data['events'].hourly_histogram()
         
-        # Novelty score
-        seen_similar = self._count_similar_seen(prompt, user_profile)
-        scores['novelty'] = 1.0 / (1.0 + seen_similar)
-        
-        # Viral potential
-        scores['viral_potential'] = self._calculate_viral_potential(prompt)
-        
-        # User affinity
-        scores['user_affinity'] = self._calculate_user_affinity(prompt, user_profile)
-        
-        # Recency
-        age_hours = (datetime.utcnow() - prompt['created_at']).total_seconds() / 3600
-        scores['recency'] = np.exp(-age_hours / 168)  # Decay over week
-        
-        # Creator trust
-        scores['creator_trust'] = self._get_creator_trust_score(prompt['creator_id'])
+        return {
+            'hourly_activity': hourly_activity,
+            'peak_hour': int(hourly_activity.argmax()) if len(user_data['events']) else None
+        }
+    
+    def _calculate_prompt_scores(self, candidates: List[Dict[str, Any]],
+                                 user_profile: Dict[str, Any]) -> np.ndarray:
+        """
+        Score every candidate for a user at once.
+        Balances multiple optimization objectives, one column per factor.
+        """
+        n = len(candidates)
+        now = time.time()
+        
+        def column(values):
+            return np.fromiter(values, dtype=float, count=n)
+        
+        # Raw prompt signals as structure-of-arrays
+        effectiveness = column(p.get('effectiveness_score', 0.5) for p in candidates)
+        usage_count = column(p.get('usage_count', 0) for p in candidates)
+        remix_count = column(p.get('remix_count', 0) for p in candidates)
+        unique_users = column(p.get('unique_users', 0) for p in candidates)
+        trending = column(p.get('trending_score', 0) for p in candidates)
+        created_at_ts = column(self._get_created_at_ts(p) for p in candidates)
+        age_hours = (now - created_at_ts) / 3600
+        
+        # Signals that depend on the user or creator still need lookups
+        seen_similar = column(self._count_similar_seen(p, user_profile) for p in candidates)
+        novelty = 1.0 / (1.0 + seen_similar)
+        affinity = column(self._calculate_user_affinity(p, user_profile) for p in candidates)
+        creator_trust = column(self._get_creator_trust_score(p['creator_id']) for p in candidates)
         
-        # Weighted combination
-        final_score = 0.0
-        for factor, weight in self.recommendation_weights.items():
-            final_score += weight * scores.get(factor, 0.0)
-            
         # Boost for exploration
-        if user_profile['exploration_appetite'] > 0.7:
-            final_score *= 1.2
-            
-        return final_score
+        boost = 1.2 if user_profile['exploration_appetite'] > 0.7 else 1.0
+        
+        # Viral potential and recency are derived inside the compiled loop
+        return _score_batch(
+            effectiveness, novelty, affinity, creator_trust, usage_count,
+            remix_count, unique_users, trending, age_hours, self._weights, boost
+        )
     
-    def _calculate_viral_potential(self, prompt: Dict[str, Any]) -> float:
+    def _get_created_at_ts(self, prompt: Dict[str, Any]) -> float:
         """
-        Predict viral spread before it happens.
-        Key insight: Low friction + high value = viral.
+        Prompt creation time as epoch seconds.
+        Falls back to the `created_at` datetime, naive ones read as UTC.
         """
-        # Current metrics
-        usage_count = prompt.get('usage_count', 0)
-        remix_count = prompt.get('remix_count', 0)
-        unique_users = prompt.get('unique_users', 0)
-        
-        # Viral indicators
-        remix_rate = remix_count / max(usage_count, 1)
-        user_retention = unique_users / max(usage_count, 1)
-        trending_momentum = prompt.get('trending_score', 0)
-        
-        # Time factor (newer prompts get boost)
-        age_hours = (datetime.utcnow() - prompt['created_at']).total_seconds() / 3600
-        recency_boost = 1.0 if age_hours < 24 else 0.8
-        
-        # Calculate potential
-        viral_score = (
-            0.4 * min(remix_rate * 10, 1.0) +      # Remix signal
-            0.3 * user_retention +                  # Stickiness
-            0.2 * trending_momentum +               # Current momentum
-            0.1 * recency_boost                     # Fresh content bonus
-        )
-        
-        return viral_score
+        created_at_ts = prompt.get('created_at_ts')
+        if created_at_ts is None:
+            created_at = prompt['created_at']
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            created_at_ts = created_at.timestamp()
+        return created_at_ts
     
-    def _apply_diversity_filter(self, scored_candidates: List[tuple], 
+    def _apply_diversity_filter(self, scored_candidates: Iterable[Tuple[float, Dict[str, Any]]], 
                                target_count: int) -> List[Dict[str, Any]]:
         """
         Ensure feed has variety.
         Prevents echo chambers, encourages discovery.
         """
         selected = []
-        seen_creators = set()
-        seen_categories = defaultdict(int)
+        creator_counts = Counter()
+        category_counts = Counter()
         max_per_creator = 2
         max_per_category = 5
         
         for score, prompt in scored_candidates:
             # Skip if too many from same creator
-            if seen_creators.count(prompt['creator_id']) >= max_per_creator:
+            creator_id = prompt['creator_id']
+            if creator_counts[creator_id] >= max_per_creator:
                 continue
                 
             # Skip if category is oversaturated
             category = self._get_prompt_category(prompt)
-            if seen_categories[category] >= max_per_category:
+            if category_counts[category] >= max_per_category:
                 continue
                 
             selected.append(prompt)
-            seen_creators.add(prompt['creator_id'])
-            seen_categories[category] += 1
+            creator_counts[creator_id] += 1
+            category_counts[category] += 1
             
             if len(selected) >= target_count:
                 break
@@ -234,41 +378,117 @@ class FeedAlgorithm:
         10% random high-quality prompts for serendipity.
         """
         exploration_slots = max(2, int(target_count * 0.1))
+        feed = feed[:target_count]
+        ranked_count = len(feed)
         
-        # Get random high-quality prompts
-        exploration_prompts = self._get_exploration_candidates(exploration_slots)
+        # Get random high-quality prompts the ranked feed doesn't already show
+        exploration_prompts = self._get_exploration_candidates(
+            exploration_slots, exclude={prompt.get('id') for prompt in feed}
+        )
+        
+        # Fill empty slots first
+        free_slots = target_count - ranked_count
+        feed.extend(exploration_prompts[:free_slots])
         
-        # Insert at random positions
-        for prompt in exploration_prompts:
-            if len(feed) >= target_count:
-                index = random.randint(0, target_count - 1)
-                feed[index] = prompt
-            else:
-                feed.append(prompt)
+        # Then replace distinct random ranked positions
+        remaining = exploration_prompts[free_slots:]
+        slots = random.sample(range(ranked_count), min(len(remaining), ranked_count))
+        for index, prompt in zip(slots, remaining):
+            feed[index] = prompt
                 
-        return feed[:target_count]
+        return feed
     
-    def _update_trending_patterns(self, prompt_id: str, interaction_type: str):
+    def _update_trending_patterns(self, prompt_id: str, type_id: Optional[int]):
         """
         Track global patterns to identify trends early.
         What's about to go viral?
         """
-        weight_map = {
-            'view': 0.1,
-            'use': 0.5,
-            'remix': 2.0,
-            'share': 1.5,
-            'skip': -0.3
+        # Unknown interaction types still age every pattern
+        weight = _TRENDING_WEIGHTS[type_id] if type_id is not None else 0.0
+        tick = self._trend_tick
+        score = self._get_trending_score(prompt_id) + weight
+        
+        # Every interaction ages all patterns by one tick, applied lazily
+        self._trend_tick = tick + 1
+        if score * TRENDING_DECAY >= TRENDING_FLOOR:
+            self._set_trending_score(prompt_id, score, tick)
+        elif prompt_id in self._trend_index:
+            self._trend_scores[self._trend_index[prompt_id]] = 0.0  # Swept later
+            
+        if self._trend_tick % TRENDING_SWEEP_INTERVAL == 0:
+            self._decay_all_trends()
+    
+    @property
+    def trending_patterns(self) -> Dict[str, float]:
+        """Snapshot of every live trending score, decayed to now"""
+        scores = self._current_trend_scores()
+        return {
+            self._trend_ids[i]: float(scores[i])
+            for i in np.flatnonzero(scores >= TRENDING_FLOOR)
         }
-        
-        weight = weight_map.get(interaction_type, 0)
-        self.trending_patterns[prompt_id] += weight
-        
-        # Decay old patterns
-        for pid in list(self.trending_patterns.keys()):
-            self.trending_patterns[pid] *= 0.99
-            if self.trending_patterns[pid] < 0.01:
-                del self.trending_patterns[pid]
+    
+    def get_top_trending(self, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        The k hottest prompts right now.
+        Partitions instead of sorting the whole table.
+        """
+        scores = self._current_trend_scores()
+        k = min(k, int(np.count_nonzero(scores >= TRENDING_FLOOR)))
+        if k <= 0:
+            return []
+            
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        return [(self._trend_ids[i], float(scores[i])) for i in top]
+    
+    def _get_trending_score(self, prompt_id: str) -> float:
+        """
+        Current trending score with decay applied on read.
+        Faded patterns count as zero until swept.
+        """
+        index = self._trend_index.get(prompt_id)
+        if index is None:
+            return 0.0
+            
+        score = float(self._trend_scores[index])
+        score *= TRENDING_DECAY ** (self._trend_tick - int(self._trend_ticks[index]))
+        return score if score >= TRENDING_FLOOR else 0.0
+    
+    def _set_trending_score(self, prompt_id: str, score: float, tick: int):
+        """Store a score as of `tick`, growing the arrays for new prompts"""
+        index = self._trend_index.get(prompt_id)
+        if index is None:
+            index = len(self._trend_ids)
+            if index == len(self._trend_scores):
+                self._trend_scores = np.concatenate((self._trend_scores, np.zeros(index)))
+                self._trend_ticks = np.concatenate((self._trend_ticks, np.zeros(index, dtype=np.int64)))
+            self._trend_index[prompt_id] = index
+            self._trend_ids.append(prompt_id)
+            
+        self._trend_scores[index] = score
+        self._trend_ticks[index] = tick
+    
+    def _current_trend_scores(self) -> np.ndarray:
+        """All stored scores decayed to the current tick"""
+        n = len(self._trend_ids)
+        elapsed = self._trend_tick - self._trend_ticks[:n]
+        return self._trend_scores[:n] * TRENDING_DECAY ** elapsed
+    
+    def _decay_all_trends(self):
+        """
+        Apply owed decay to every pattern at once and drop faded ones.
+        Runs every TRENDING_SWEEP_INTERVAL interactions, not per event.
+        """
+        n = len(self._trend_ids)
+        scores = self._current_trend_scores()
+        keep = np.flatnonzero(scores >= TRENDING_FLOOR)
+        
+        # Compact survivors to the front of the arrays
+        self._trend_ids = [self._trend_ids[i] for i in keep]
+        self._trend_index = {pid: i for i, pid in enumerate(self._trend_ids)}
+        self._trend_scores[:len(keep)] = scores[keep]
+        self._trend_scores[len(keep):n] = 0.0
+        self._trend_ticks[:n] = self._trend_tick
     
     def _check_viral_threshold(self, prompt_id: str):
         """
@@ -296,30 +516,44 @@ class FeedAlgorithm:
         """
         # This would trigger notifications, special placement, etc.
         # Simplified for architecture demonstration
-        self.trending_patterns[prompt_id] *= 2.0
+        score = self._get_trending_score(prompt_id)
+        if score:
+            self._set_trending_score(prompt_id, score * 2.0, self._trend_tick)
         
     def _get_prompt_category(self, prompt: Dict[str, Any]) -> str:
         """
         Categorize prompt for diversity filtering.
         Uses NLP in production, simplified here.
         """
-        template = prompt.get('template', '').lower()
-        
-        if 'startup' in template or 'business' in template:
-            return 'business'
-        elif 'code' in template or 'programming' in template:
-            return 'technical'
-        elif 'write' in template or 'story' in template:
-            return 'creative'
-        elif 'analyze' in template or 'data' in template:
-            return 'analytical'
-        else:
-            return 'general'
+        return self._template_category(prompt.get('template', ''))
     
-    def _get_exploration_candidates(self, count: int) -> List[Dict[str, Any]]:
+    def _categorize_template(self, template: str) -> str:
+        """Highest priority keyword found anywhere in the template wins"""
+        rank = min(
+            (match.lastindex for match in self._category_regex.finditer(template.lower())),
+            default=None
+        )
+        return CATEGORY_KEYWORDS[rank - 1][1] if rank is not None else 'general'
+    
+    def _get_exploration_candidates(self, count: int, exclude: Set[Any] = frozenset()) -> List[Dict[str, Any]]:
         """
         Get high-quality random prompts for exploration.
-        Ensures users discover outside their bubble.
+        Ensures users discover outside their bubble; ids in exclude are skipped.
+        """
+        now = time.time()
+        if now - self._exploration_pool_loaded_at > EXPLORATION_POOL_TTL:
+            self._exploration_pool = self._load_exploration_pool()
+            self._exploration_pool_loaded_at = now
+            
+        pool = self._exploration_pool
+        if exclude:
+            pool = [prompt for prompt in pool if prompt.get('id') not in exclude]
+        return random.sample(pool, min(count, len(pool)))
+    
+    def _load_exploration_pool(self) -> List[Dict[str, Any]]:
+        """
+        Fetch the pool of high-performing prompts to explore from.
+        Called at most once per EXPLORATION_POOL_TTL.
         """
         # This would query database for random high-performing prompts
         # Simplified for demonstration
@@ -332,29 +566,3 @@ class FeedAlgorithm:
         """
         # Simplified for demonstration
         return None
-
-# Usage example showing viral mechanics
-if __name__ == "__main__":
-    algorithm = FeedAlgorithm()
-    
-    # User interacts with prompts
-    algorithm.record_interaction(
-        user_id="user_123",
-        prompt_id="prompt_456",
-        interaction_type="use",
-        metadata={'satisfaction': 0.9}
-    )
-    
-    # User creates a remix
-    algorithm.record_interaction(
-        user_id="user_123",
-        prompt_id="prompt_456",
-        interaction_type="remix",
-        metadata={'modifications': 'minor'}
-    )
-    
-    # Get personalized feed
-    feed = algorithm.get_feed("user_123", count=20)
-    
-    # Track what goes viral
-    print(f"Trending prompts: {list(algorithm.trending_patterns.keys())[:5]}")
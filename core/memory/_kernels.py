@@ -0,0 +1,41 @@
+"""
+Compiled kernels for the recursive memory shell.
+The arithmetic core of remembering, kept free of dicts and objects.
+"""
+
+import numpy as np
+
+from .._jit import HAVE_NUMBA, njit, disk_cache
+
+if HAVE_NUMBA:
+    # The explicit signature compiles the kernel at import, once, for the one
+    # layout the shell passes, so calls skip type inference entirely
+    @njit('void(float32[:], intp[:], float32[:], float32)', cache=disk_cache(__name__), fastmath=True)
+    def ema_update(arr, idx, vals, alpha):
+        """Blend vals into arr at idx in order, so a repeated index blends repeatedly"""
+        keep = 1.0 - alpha
+        for i in range(idx.size):
+            arr[idx[i]] = arr[idx[i]] * keep + vals[i] * alpha
+else:
+    def ema_update(arr, idx, vals, alpha):
+        """Blend vals into arr at idx in order, so a repeated index blends repeatedly"""
+        keep = np.float32(1.0) - alpha
+        
+        # The common case, each index once: a single vectorized blend
+        if len(set(idx.tolist())) == idx.size:
+            arr[idx] = arr[idx] * keep + vals * alpha
+            return
+            
+        # Otherwise number each update by how many earlier ones hit its index,
+        # then blend round by round so repeats still apply in order
+        order = np.argsort(idx, kind='stable')
+        grouped = idx[order]
+        first = np.empty(idx.size, dtype=bool)
+        first[0] = True
+        np.not_equal(grouped[1:], grouped[:-1], out=first[1:])
+        starts = np.flatnonzero(first)
+        rounds = np.arange(idx.size) - np.repeat(starts, np.diff(starts, append=idx.size))
+        for r in range(int(rounds.max()) + 1):
+            updates = order[rounds == r]
+            slots = idx[updates]
+            arr[slots] = arr[slots] * keep + vals[updates] * alpha
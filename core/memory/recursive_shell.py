@@ -5,12 +5,214 @@ Like how Airbnb listings improve through guest feedback.
 """
 
 import numpy as np
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Tuple
 from dataclasses import dataclass, field
-from collections import defaultdict
+from collections import Counter, OrderedDict, deque
 from datetime import datetime
-import json
-import uuid
+import heapq
+import sys
+import time
+from operator import itemgetter
+
+# Offset from the monotonic clock to wall-clock epoch ns, fixed at import
+_EPOCH_OFFSET_NS = time.time_ns() - time.monotonic_ns()
+
+def _ns_to_iso(monotonic_ns: int) -> str:
+    """Monotonic timestamp as an ISO-8601 UTC string, for serialization only"""
+    return datetime.utcfromtimestamp((monotonic_ns + _EPOCH_OFFSET_NS) / 1e9).isoformat()
+
+# Confidence moves slowly, so it is only recomputed every this many uses
+CONFIDENCE_BUCKET = 16
+
+# A layer never deepens before it has seen more than this many interactions
+MIN_DEEPEN_INTERACTIONS = 20
+
+# Users whose adaptations are kept, least recently seen go first
+MAX_ADAPTED_USERS = 10_000
+
+# Evolution records kept; older ones roll off, the generation count does not
+EVOLUTION_HISTORY_SIZE = 128
+
+# How many of the strongest patterns are tracked for evolution and suggestions
+TOP_PATTERNS = 10
+
+# Bucket patterns, one name per bucket so each learns its own success rate
+LENGTH_PATTERNS = ('response_length_short', 'response_length_medium',
+                   'response_length_long', 'response_length_very_long')
+SPEED_PATTERNS = ('speed_instant', 'speed_fast', 'speed_steady', 'speed_slow')
+
+# Compiled EMA kernel, bound on first use so importing the shell never loads Numba
+_ema_update: Optional[Callable] = None
+
+def _load_ema_update() -> Callable:
+    global _ema_update
+    from ._kernels import ema_update
+    _ema_update = ema_update
+    return ema_update
+
+def _strongest_distinct(candidates: List[Tuple[str, float]]) -> List[Tuple[str, float]]:
+    """Top patterns by name, each at the best strength any layer gave it"""
+    best: Dict[str, float] = {}
+    for pattern, strength in candidates:
+        if strength > best.get(pattern, -np.inf):
+            best[pattern] = strength
+    return heapq.nlargest(TOP_PATTERNS, best.items(), key=itemgetter(1))
+
+class PatternStore:
+    """
+    Learned pattern strengths packed into one float32 array.
+    Each pattern name owns a slot; new names take the next free one.
+    """
+    
+    def __init__(self, capacity: int = 16):
+        self.strengths = np.zeros(capacity, dtype=np.float32)
+        self.index_map: Dict[str, int] = {}
+        self.names: List[str] = []
+        
+        # Slots of the strongest patterns, kept current as strengths move
+        self._top: set = set()
+        self._top_stale = False
+        
+    def __len__(self) -> int:
+        return len(self.index_map)
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self.index_map
+    
+    def get(self, name: str, default: Optional[float] = None) -> Optional[float]:
+        index = self.index_map.get(name)
+        return default if index is None else float(self.strengths[index])
+    
+    def items(self) -> List[Tuple[str, float]]:
+        """(pattern, strength) pairs for callers that need to iterate"""
+        strengths = self.strengths
+        return [(name, float(strengths[index])) for name, index in self.index_map.items()]
+    
+    def update(self, patterns: Dict[str, float], alpha: float):
+        """Move every given pattern toward its new strength in one vectorized pass"""
+        self.update_many([patterns], alpha)
+        
+    def update_many(self, batch: List[Dict[str, float]], alpha: float):
+        """Apply several pattern updates in order, staged into one kernel call"""
+        count = sum(map(len, batch))
+        if not count:
+            return
+            
+        slot = self._slot
+        idx = np.fromiter(
+            (slot(name) for patterns in batch for name in patterns),
+            dtype=np.intp, count=count
+        )
+        targets = np.fromiter(
+            (strength for patterns in batch for strength in patterns.values()),
+            dtype=np.float32, count=count
+        )
+        ema_update = _ema_update or _load_ema_update()
+        
+        floor = self._top_floor()
+        ema_update(self.strengths, idx, targets, np.float32(alpha))
+        if not self._top_stale:
+            self._track_top(list(dict.fromkeys(idx.tolist())), floor)
+        
+    def top(self) -> List[Tuple[str, float]]:
+        """Strongest patterns first, ties going to the one learned earlier"""
+        if self._top_stale:
+            self._rebuild_top()
+            
+        values, names = self.strengths, self.names
+        return [(names[slot], float(values[slot]))
+                for slot in sorted(self._top, key=self._rank, reverse=True)]
+    
+    def _rebuild_top(self):
+        """Reselect the top set with an O(n) partition instead of a full sort"""
+        count = len(self.names)
+        if count <= TOP_PATTERNS:
+            self._top = set(range(count))
+        else:
+            values = self.strengths[:count]
+            kth = values[np.argpartition(values, -TOP_PATTERNS)[-TOP_PATTERNS:]].min()
+            
+            # Everything strictly stronger, then ties by earliest slot
+            above = np.flatnonzero(values > kth)
+            tied = np.flatnonzero(values == kth)[:TOP_PATTERNS - above.size]
+            self._top = set(above.tolist()) | set(tied.tolist())
+        self._top_stale = False
+    
+    def _rank(self, slot: int) -> Tuple[float, int]:
+        return self.strengths[slot], -slot
+    
+    def _top_floor(self) -> Optional[Tuple[float, int]]:
+        """Weakest tracked rank, or None while every pattern is tracked"""
+        if len(self._top) < TOP_PATTERNS:
+            return None
+        return min(map(self._rank, self._top))
+    
+    def _track_top(self, slots: List[int], floor: Optional[Tuple[float, int]]):
+        """Fold freshly updated slots into the top set"""
+        top = self._top
+        
+        # A tracked pattern that fell below the old floor may have been
+        # overtaken by an untracked one, only a rescan can tell
+        if floor is not None and any(
+            slot in top and self._rank(slot) < floor for slot in slots
+        ):
+            self._top_stale = True
+            return
+            
+        for slot in slots:
+            if slot in top:
+                continue
+            if len(top) < TOP_PATTERNS:
+                top.add(slot)
+            else:
+                weakest = min(top, key=self._rank)
+                if self._rank(slot) > self._rank(weakest):
+                    top.remove(weakest)
+                    top.add(slot)
+        
+    def copy(self) -> 'PatternStore':
+        clone = PatternStore(capacity=0)
+        clone.strengths = self.strengths.copy()
+        clone.index_map = dict(self.index_map)
+        clone.names = list(self.names)
+        clone._top = set(self._top)
+        clone._top_stale = self._top_stale
+        return clone
+    
+    def _slot(self, name: str) -> int:
+        """Slot for a pattern, allocating (at strength 0) on first sight"""
+        index = self.index_map.get(name)
+        if index is None:
+            name = sys.intern(name)  # The canonical copy every layer shares
+            index = len(self.index_map)
+            if index == len(self.strengths):
+                self.strengths = np.concatenate((self.strengths, np.zeros(max(index, 16), dtype=np.float32)))
+            self.index_map[name] = index
+            self.names.append(name)
+        return index
+
+class LayerStats:
+    """
+    Per-layer counters as parallel arrays, one row per layer.
+    Totals across the whole memory are a single reduction.
+    """
+    
+    def __init__(self, capacity: int = 16):
+        self.size = 0
+        self.interaction_counts = np.zeros(capacity, dtype=np.int64)
+        self.pattern_counts = np.zeros(capacity, dtype=np.int64)  # Patterns first learned in the layer
+        self.effectiveness_delta = np.zeros(capacity, dtype=np.float32)
+        
+    def append(self) -> int:
+        """Open a zeroed row for a new layer, doubling storage when full"""
+        row = self.size
+        if row == len(self.interaction_counts):
+            grow = max(row, 16)
+            self.interaction_counts = np.concatenate((self.interaction_counts, np.zeros(grow, dtype=np.int64)))
+            self.pattern_counts = np.concatenate((self.pattern_counts, np.zeros(grow, dtype=np.int64)))
+            self.effectiveness_delta = np.concatenate((self.effectiveness_delta, np.zeros(grow, dtype=np.float32)))
+        self.size += 1
+        return row
 
 @dataclass
 class MemoryLayer:
@@ -20,38 +222,79 @@ class MemoryLayer:
     """
     layer_id: str
     depth: int
-    created_at: datetime
-    interaction_count: int = 0
-    learned_patterns: Dict[str, float] = field(default_factory=dict)
-    user_adaptations: Dict[str, Any] = field(default_factory=dict)
-    effectiveness_delta: float = 0.0
+    created_at_ns: int  # time.monotonic_ns()
+    stats: LayerStats = field(default_factory=LayerStats, repr=False)
+    row: int = -1
+    learned_patterns: PatternStore = field(default_factory=PatternStore)
+    user_adaptations: OrderedDict = field(default_factory=OrderedDict)  # LRU, shared like patterns
+    
+    def __post_init__(self):
+        if self.row < 0:
+            self.row = self.stats.append()
+    
+    @property
+    def interaction_count(self) -> int:
+        return int(self.stats.interaction_counts[self.row])
+    
+    @interaction_count.setter
+    def interaction_count(self, value: int):
+        self.stats.interaction_counts[self.row] = value
+        
+    @property
+    def effectiveness_delta(self) -> float:
+        return float(self.stats.effectiveness_delta[self.row])
+    
+    @effectiveness_delta.setter
+    def effectiveness_delta(self, value: float):
+        self.stats.effectiveness_delta[self.row] = value
     
     def integrate_experience(self, interaction_data: Dict[str, Any]):
         """Memory deepens through experience"""
-        self.interaction_count += 1
-        
-        # Learn from user patterns
-        user_id = interaction_data.get('user_id')
-        if user_id:
-            if user_id not in self.user_adaptations:
-                self.user_adaptations[user_id] = defaultdict(float)
-            
-            # Track what works for each user
-            success_metric = interaction_data.get('success_metric', 0.5)
-            self.user_adaptations[user_id]['success_rate'] = (
-                self.user_adaptations[user_id]['success_rate'] * 0.9 +
-                success_metric * 0.1
-            )
-        
-        # Update learned patterns
-        patterns = interaction_data.get('patterns', {})
-        for pattern, strength in patterns.items():
-            if pattern not in self.learned_patterns:
-                self.learned_patterns[pattern] = 0.0
-            self.learned_patterns[pattern] = (
-                self.learned_patterns[pattern] * 0.8 +
-                strength * 0.2
-            )
+        self.integrate_experiences([interaction_data])
+        
+    def integrate_experiences(self, batch: List[Dict[str, Any]]):
+        """Several experiences at once, folded in the order they happened"""
+        stats, row = self.stats, self.row
+        stats.interaction_counts[row] += len(batch)
+        
+        adaptations = self.user_adaptations  # Oldest first
+        for interaction_data in batch:
+            # Learn from user patterns
+            user_id = interaction_data.get('user_id')
+            if user_id:
+                adaptation = adaptations.get(user_id)
+                if adaptation is None:
+                    adaptation = adaptations[user_id] = {}
+                    if len(adaptations) > MAX_ADAPTED_USERS:
+                        adaptations.popitem(last=False)
+                else:
+                    adaptations.move_to_end(user_id)
+                
+                # Track what works for each user
+                success_metric = interaction_data.get('success_metric', 0.5)
+                adaptation['success_rate'] = (
+                    adaptation.get('success_rate', 0.0) * 0.9 +
+                    success_metric * 0.1
+                )
+        
+        # Update learned patterns (EMA, new patterns start from 0)
+        known = len(self.learned_patterns)
+        self.learned_patterns.update_many(
+            [interaction_data.get('patterns', {}) for interaction_data in batch],
+            alpha=0.2
+        )
+        stats.pattern_counts[row] += len(self.learned_patterns) - known
+
+@dataclass(slots=True)
+class MemoryResponse:
+    """
+    What remember() hands back after learning.
+    The template as it now stands, and how well it knows you.
+    """
+    adapted_template: str
+    memory_depth: int
+    personalization: Dict[str, Any]
+    evolution_stage: int
 
 class RecursiveMemoryShell:
     """
@@ -67,19 +310,29 @@ class RecursiveMemoryShell:
         
         # Memory layers accumulate over time
         self.memory_layers: List[MemoryLayer] = []
+        self.layer_stats = LayerStats()
         self.current_depth = 0
+        self._layer_counter = 0  # Layer ids only need to be unique per shell
+        
+        # Strongest patterns as they stood when each earlier layer closed
+        self._retired_top: List[Tuple[str, float]] = []
         
         # Behavioral patterns learned through use
+        # Plain dicts so read-only probes never insert keys
         self.behavioral_memory = {
-            'successful_contexts': defaultdict(float),
-            'failure_patterns': defaultdict(float),
-            'user_preferences': defaultdict(dict),
-            'optimal_parameters': defaultdict(float),
+            'successful_contexts': {},
+            'failure_patterns': Counter(),
+            'user_preferences': {},
+            'optimal_parameters': {},
             'remix_genealogy': []
         }
         
+        # Context key layout that pattern extraction is specialised to
+        self._context_schema: Optional[Tuple[Tuple[str, str], ...]] = None
+        
         # Recursive improvements
-        self.evolution_history = []
+        self.evolution_history = deque(maxlen=EVOLUTION_HISTORY_SIZE)
+        self._evolution_count = 0
         self.mutation_rate = 0.05  # Small changes over time
         
         # Performance tracking
@@ -90,75 +343,142 @@ class RecursiveMemoryShell:
             'memory_density': 0.0
         }
         
+        # Confidence, recomputed only when its inputs move
+        self._confidence_cache = 0.0
+        self._confidence_key: Optional[Tuple[int, int]] = None
+        
         # Initialize first memory layer
         self._create_new_layer()
     
-    def remember(self, interaction: Dict[str, Any]) -> Dict[str, Any]:
+    def remember(self, interaction: Dict[str, Any]) -> MemoryResponse:
         """
         Core method: Learn from each interaction.
         Memory compounds like interest.
         """
-        self.performance_metrics['total_uses'] += 1
-        
-        # Extract interaction metadata
-        context = interaction.get('context', {})
-        result = interaction.get('result', {})
-        user_id = interaction.get('user_id')
-        success_metric = result.get('success', 0.5)
-        
-        # Update current memory layer
+        return self.remember_many([interaction])
+    
+    def remember_many(self, interactions: List[Dict[str, Any]]) -> MemoryResponse:
+        """
+        Learn from a batch of interactions in one pass.
+        Leaves the same state as calling remember on each in turn.
+        """
+        # Experiences are staged and folded in together, flushed whenever
+        # the layer could deepen or confidence is due for a refresh
         current_layer = self.memory_layers[-1]
-        current_layer.integrate_experience({
-            'user_id': user_id,
-            'success_metric': success_metric,
-            'patterns': self._extract_patterns(context, result)
-        })
-        
-        # Learn behavioral patterns
-        self._update_behavioral_memory(context, result, user_id)
-        
-        # Check if new layer needed (depth increase)
-        if self._should_deepen_memory(current_layer):
-            self._create_new_layer()
-            self._evolve_template()
-        
-        # Calculate memory response
+        pending = []
+        context, user_id = {}, None
+        for interaction in interactions:
+            self.performance_metrics['total_uses'] += 1
+            
+            # Extract interaction metadata
+            context = interaction.get('context', {})
+            result = interaction.get('result', {})
+            user_id = interaction.get('user_id')
+            if type(user_id) is str:
+                user_id = sys.intern(user_id)
+            pending.append({
+                'user_id': user_id,
+                'success_metric': result.get('success', 0.5),
+                'patterns': self._extract_patterns(context, result)
+            })
+            
+            # Learn behavioral patterns
+            self._update_behavioral_memory(context, result, user_id)
+            
+            may_deepen = current_layer.interaction_count + len(pending) > MIN_DEEPEN_INTERACTIONS
+            if not may_deepen and self._confidence_key == self._confidence_cache_key():
+                continue
+            
+            # Update current memory layer
+            current_layer.integrate_experiences(pending)
+            pending = []
+            
+            # Check if new layer needed (depth increase)
+            if may_deepen and self._should_deepen_memory(current_layer):
+                self._create_new_layer()
+                self._evolve_template()
+                current_layer = self.memory_layers[-1]
+                
+            # Confidence as remember would have refreshed it at this point
+            self._calculate_confidence_score()
+        
+        if pending:
+            current_layer.integrate_experiences(pending)
+        
+        # Calculate memory response, personalised to the latest interaction
         memory_response = self._generate_memory_response(context, user_id)
         
-        return {
-            'adapted_template': self.current_template,
-            'memory_depth': self.current_depth,
-            'personalization': memory_response,
-            'evolution_stage': len(self.evolution_history)
-        }
+        return MemoryResponse(
+            adapted_template=self.current_template,
+            memory_depth=self.current_depth,
+            personalization=memory_response,
+            evolution_stage=self._evolution_count
+        )
     
     def _extract_patterns(self, context: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, float]:
         """
         Extract meaningful patterns from interaction.
         What made this interaction successful or not?
         """
-        patterns = {}
-        
         # Context patterns
-        for key, value in context.items():
-            if isinstance(value, str):
-                pattern_key = f"context_{key}_{value[:20]}"
-                patterns[pattern_key] = result.get('success', 0.5)
+        success = result.get('success', 0.5)
+        patterns = self._extract_context_patterns(context, success)
+        
+        # Bucket patterns record whether this interaction was a high success,
+        # so a bucket's strength is its success rate, not its ordinal
+        hit = 1.0 if success > 0.8 else 0.0
         
         # Result patterns
         response_length = len(str(result.get('response', '')))
-        patterns['response_length_category'] = self._categorize_length(response_length)
+        patterns[self._categorize_length(response_length)] = hit
         
         # Timing patterns
         execution_time = result.get('execution_time', 1.0)
-        patterns['speed_category'] = self._categorize_speed(execution_time)
+        patterns[self._categorize_speed(execution_time)] = hit
         
         # Success correlation patterns
-        if result.get('success', 0.5) > 0.8:
+        if hit:
             patterns['high_success_indicator'] = 1.0
             
         return patterns
     
+    def _categorize_length(self, length: int) -> str:
+        """Pattern for a response length bucket: short, medium, long, very long"""
+        return LENGTH_PATTERNS[0 if length < 50 else 1 if length < 200 else 2 if length < 1000 else 3]
+    
+    def _categorize_speed(self, execution_time: float) -> str:
+        """Pattern for an execution time bucket: instant, fast, steady, slow"""
+        return SPEED_PATTERNS[
+            0 if execution_time < 0.5 else 1 if execution_time < 2.0 else 2 if execution_time < 5.0 else 3
+        ]
+    
+    def _extract_context_patterns(self, context: Dict[str, Any], success: float) -> Dict[str, float]:
+        """
+        One pattern per string-valued context entry.
+        Specialised to the first context seen when every value is a string.
+        """
+        intern = sys.intern
+        schema = self._context_schema
+        if schema is None:
+            # Remember the key layout once; () means the contexts are mixed
+            all_strings = all(isinstance(value, str) for value in context.values())
+            schema = self._context_schema = (
+                tuple((key, f"context_{key}_") for key in context) if all_strings else ()
+            )
+        
+        # Same keys by name, with concatenation doubling as the str check
+        if schema and len(context) == len(schema):
+            try:
+                return {intern(prefix + context[key][:20]): success for key, prefix in schema}
+            except (KeyError, TypeError):
+                pass
+                
+        return {
+            intern(f"context_{key}_{value[:20]}"): success
+            for key, value in context.items()
+            if isinstance(value, str)
+        }
+    
     def _update_behavioral_memory(self, context: Dict[str, Any], result: Dict[str, Any], user_id: str):
         """
         Build behavioral understanding over time.
@@ -168,28 +488,46 @@ class RecursiveMemoryShell:
         
         # Track successful contexts
         context_key = self._generate_context_key(context)
-        self.behavioral_memory['successful_contexts'][context_key] = (
-            self.behavioral_memory['successful_contexts'][context_key] * 0.9 +
+        successful_contexts = self.behavioral_memory['successful_contexts']
+        successful_contexts[context_key] = (
+            successful_contexts.get(context_key, 0.0) * 0.9 +
             success * 0.1
         )
         
-        # Track failure patterns
+        # Track failure patterns (their own counter, so the key is reused as is)
         if success < 0.3:
-            failure_key = f"{context_key}_failure"
-            self.behavioral_memory['failure_patterns'][failure_key] += 1
+            self.behavioral_memory['failure_patterns'][context_key] += 1
         
         # User preference learning
         if user_id:
-            if user_id not in self.behavioral_memory['user_preferences']:
-                self.behavioral_memory['user_preferences'][user_id] = {}
-            
-            user_prefs = self.behavioral_memory['user_preferences'][user_id]
+            user_prefs = self.behavioral_memory['user_preferences'].setdefault(user_id, {})
             user_prefs['avg_success'] = (
                 user_prefs.get('avg_success', 0.5) * 0.9 +
                 success * 0.1
             )
             user_prefs['preferred_style'] = self._infer_style_preference(context, result)
     
+    def _infer_style_preference(self, context: Dict[str, Any], result: Dict[str, Any]) -> str:
+        """
+        The style a user asked for, or how long they let answers run.
+        Explicit choices win over inferred ones.
+        """
+        for key in ('style', 'approach'):
+            style = context.get(key)
+            if isinstance(style, str) and style:
+                return style
+        return self._categorize_length(len(str(result.get('response', ''))))
+    
+    def _generate_context_key(self, context: Dict[str, Any]) -> int:
+        """
+        Fingerprint a context by its scalar values.
+        Same situation, same key, whatever order it arrived in.
+        """
+        return hash(tuple(sorted(
+            (key, value) for key, value in context.items()
+            if isinstance(value, (str, int, float))
+        )))
+    
     def _should_deepen_memory(self, current_layer: MemoryLayer) -> bool:
         """
         Decide when to create new memory layer.
@@ -200,7 +538,7 @@ class RecursiveMemoryShell:
             return True
             
         # Deepen if effectiveness plateaus
-        if abs(current_layer.effectiveness_delta) < 0.01 and current_layer.interaction_count > 20:
+        if abs(current_layer.effectiveness_delta) < 0.01 and current_layer.interaction_count > MIN_DEEPEN_INTERACTIONS:
             return True
             
         # Deepen if patterns stabilize
@@ -210,24 +548,42 @@ class RecursiveMemoryShell:
             
         return False
     
+    def _calculate_pattern_stability(self, patterns: PatternStore) -> float:
+        """
+        Share of learned patterns that have settled near 0 or 1.
+        Settled patterns have stopped teaching the layer anything new.
+        """
+        count = len(patterns)
+        if not count:
+            return 0.0
+        values = patterns.strengths[:count]
+        return float(np.count_nonzero((values < 0.1) | (values > 0.9))) / count
+    
     def _create_new_layer(self):
         """
         Add new memory layer, increasing depth.
         Each layer represents accumulated wisdom.
         """
         new_layer = MemoryLayer(
-            layer_id=str(uuid.uuid4()),
+            layer_id=f"{self.id}:{self._layer_counter}",
             depth=self.current_depth,
-            created_at=datetime.utcnow()
+            created_at_ns=time.monotonic_ns(),
+            stats=self.layer_stats
         )
         
-        # Inherit patterns from previous layer
+        # Inherit patterns and user adaptations from previous layer; both
+        # only ever change through the newest layer, so they are shared
+        # rather than copied and the closing layer keeps just its top patterns
         if self.memory_layers:
             previous_layer = self.memory_layers[-1]
-            new_layer.learned_patterns = previous_layer.learned_patterns.copy()
-            new_layer.user_adaptations = previous_layer.user_adaptations.copy()
+            self._retired_top = _strongest_distinct(
+                self._retired_top + previous_layer.learned_patterns.top()
+            )
+            new_layer.learned_patterns = previous_layer.learned_patterns
+            new_layer.user_adaptations = previous_layer.user_adaptations
         
         self.memory_layers.append(new_layer)
+        self._layer_counter += 1
         self.current_depth += 1
         
         # Update memory density metric
@@ -250,50 +606,88 @@ class RecursiveMemoryShell:
             self.current_template = mutation
             
             # Record evolution
+            self._evolution_count += 1
             self.evolution_history.append({
-                'generation': len(self.evolution_history) + 1,
+                'generation': self._evolution_count,
                 'old_template': old_template,
                 'new_template': mutation,
                 'trigger_patterns': successful_patterns,
-                'timestamp': datetime.utcnow()
+                'timestamp_ns': time.monotonic_ns()
             })
             
             # Adjust mutation rate based on success
             self._adjust_mutation_rate()
     
+    def _generate_template_mutation(self, successful_patterns: List[Tuple[str, float]]) -> Optional[str]:
+        """
+        Fold the strongest new lesson into the template.
+        None when every lesson is already part of it.
+        """
+        for pattern, _ in successful_patterns:
+            # Braces would read as new format fields
+            recommendation = self._pattern_to_recommendation(pattern).replace('{', '').replace('}', '')
+            if recommendation not in self.current_template:
+                return f"{self.current_template} ({recommendation})"
+        return None
+    
+    def _adjust_mutation_rate(self):
+        """
+        Mutate less once evolutions rest on strong patterns, more when not.
+        Kept between 1% and 20%.
+        """
+        factor = 0.9 if self._calculate_evolution_success() > 0.8 else 1.1
+        self.mutation_rate = min(max(self.mutation_rate * factor, 0.01), 0.2)
+    
     def _generate_memory_response(self, context: Dict[str, Any], user_id: Optional[str]) -> Dict[str, Any]:
         """
         Generate response based on accumulated memory.
         Personalized for user if history exists.
         """
-        response = {
-            'confidence': self._calculate_confidence_score(),
-            'adaptations': {},
-            'suggestions': []
-        }
+        adaptations = {}
         
         # Apply user-specific adaptations
-        if user_id and user_id in self.behavioral_memory['user_preferences']:
-            user_prefs = self.behavioral_memory['user_preferences'][user_id]
-            response['adaptations']['style'] = user_prefs.get('preferred_style', 'default')
-            response['adaptations']['success_prediction'] = user_prefs.get('avg_success', 0.5)
+        user_prefs = self.behavioral_memory['user_preferences'].get(user_id) if user_id else None
+        if user_prefs is not None:
+            adaptations['style'] = user_prefs.get('preferred_style', 'default')
+            adaptations['success_prediction'] = user_prefs.get('avg_success', 0.5)
         
         # Apply context-specific adaptations
         context_key = self._generate_context_key(context)
-        if context_key in self.behavioral_memory['successful_contexts']:
-            success_rate = self.behavioral_memory['successful_contexts'][context_key]
-            response['adaptations']['context_confidence'] = success_rate
-        
-        # Generate suggestions based on patterns
-        top_patterns = self._get_top_patterns()
-        for pattern, strength in top_patterns[:3]:
-            response['suggestions'].append({
+        success_rate = self.behavioral_memory['successful_contexts'].get(context_key)
+        if success_rate is not None:
+            adaptations['context_confidence'] = success_rate
+        
+        # Generate suggestions based on patterns, sized once for the top three
+        suggestions = [
+            {
                 'pattern': pattern,
                 'strength': strength,
                 'recommendation': self._pattern_to_recommendation(pattern)
-            })
+            }
+            for pattern, strength in self._get_top_patterns()[:3]
+        ]
         
-        return response
+        return {
+            'confidence': self._calculate_confidence_score(),
+            'adaptations': adaptations,
+            'suggestions': suggestions
+        }
+    
+    def _pattern_to_recommendation(self, pattern: str) -> str:
+        """
+        Plain-language advice for a learned pattern.
+        What the memory would tell the next user.
+        """
+        if pattern in LENGTH_PATTERNS:
+            return f"aim for {pattern[len('response_length_'):].replace('_', ' ')} responses"
+        if pattern in SPEED_PATTERNS:
+            return f"keep responses {pattern[len('speed_'):]}"
+        if pattern == 'high_success_indicator':
+            return "keep doing what works"
+        if pattern.startswith('context_'):
+            key, _, value = pattern[len('context_'):].partition('_')
+            return f"{key}: {value}"
+        return f"lean into {pattern}"
     
     def _calculate_memory_density(self) -> float:
         """
@@ -303,15 +697,10 @@ class RecursiveMemoryShell:
         if not self.memory_layers:
             return 0.0
             
-        total_patterns = sum(
-            len(layer.learned_patterns) 
-            for layer in self.memory_layers
-        )
-        
-        total_interactions = sum(
-            layer.interaction_count 
-            for layer in self.memory_layers
-        )
+        # Each pattern is counted in the layer that first learned it
+        stats = self.layer_stats
+        total_patterns = int(stats.pattern_counts[:stats.size].sum())
+        total_interactions = int(stats.interaction_counts[:stats.size].sum())
         
         # Density increases with patterns per interaction
         density = total_patterns / max(total_interactions, 1)
@@ -320,13 +709,18 @@ class RecursiveMemoryShell:
         total_users = len(self.behavioral_memory['user_preferences'])
         user_density = total_users / max(total_interactions, 1)
         
-        return (density * 0.7 + user_density * 0.3)
+        return density * 0.7 + user_density * 0.3
     
     def _calculate_confidence_score(self) -> float:
         """
         How confident is the memory in its adaptations?
         Based on volume and consistency of experiences.
         """
+        # Reuse the last score until another bucket of uses or an evolution
+        cache_key = self._confidence_cache_key()
+        if cache_key == self._confidence_key:
+            return self._confidence_cache
+        
         # Base confidence on experience volume
         experience_factor = min(self.performance_metrics['total_uses'] / 1000, 1.0)
         
@@ -346,25 +740,55 @@ class RecursiveMemoryShell:
             evolution_factor * 0.2
         )
         
+        self._confidence_key = cache_key
+        self._confidence_cache = confidence
         return confidence
     
+    def _confidence_cache_key(self) -> Tuple[int, int]:
+        """Inputs that invalidate the cached confidence when they move"""
+        return (
+            self.performance_metrics['total_uses'] // CONFIDENCE_BUCKET,
+            self._evolution_count
+        )
+    
+    def _calculate_average_pattern_stability(self) -> float:
+        """
+        Stability of everything the memory has learned.
+        Layers share one pattern store, so the live layer speaks for all.
+        """
+        return self._calculate_pattern_stability(self.memory_layers[-1].learned_patterns)
+    
+    def _calculate_evolution_success(self) -> float:
+        """
+        Average strength of the patterns behind recent evolutions.
+        Neutral 0.5 before the template has evolved.
+        """
+        strengths = [
+            strength
+            for record in self.evolution_history
+            for _, strength in record['trigger_patterns']
+        ]
+        return sum(strengths) / len(strengths) if strengths else 0.5
+    
     def _identify_successful_patterns(self) -> List[Tuple[str, float]]:
         """
         Find patterns that correlate with success.
         Success leaves clues in the data.
         """
-        successful_patterns = []
-        
-        # Analyze all layers
-        for layer in self.memory_layers:
-            for pattern, strength in layer.learned_patterns.items():
-                if strength > 0.7:  # High correlation with success
-                    successful_patterns.append((pattern, strength))
-        
-        # Sort by strength
-        successful_patterns.sort(key=lambda x: x[1], reverse=True)
-        
-        return successful_patterns[:10]  # Top 10 patterns
+        # Earlier layers' best plus the live layer's best covers every layer;
+        # a pattern inherited by many layers still counts once
+        candidates = self._retired_top + self._get_top_patterns()
+        return [
+            (pattern, strength) for pattern, strength in _strongest_distinct(candidates)
+            if strength > 0.7  # High correlation with success
+        ]
+    
+    def _get_top_patterns(self) -> List[Tuple[str, float]]:
+        """
+        Strongest patterns in the live memory layer.
+        What the prompt currently knows best.
+        """
+        return self.memory_layers[-1].learned_patterns.top()
     
     def get_memory_state(self) -> Dict[str, Any]:
         """
@@ -375,48 +799,13 @@ class RecursiveMemoryShell:
             'id': self.id,
             'current_template': self.current_template,
             'depth': self.current_depth,
+            'created_at': _ns_to_iso(self.memory_layers[0].created_at_ns),
+            'last_deepened_at': _ns_to_iso(self.memory_layers[-1].created_at_ns),
             'layer_count': len(self.memory_layers),
             'total_interactions': self.performance_metrics['total_uses'],
             'success_rate': self.performance_metrics['success_rate'],
             'memory_density': self.performance_metrics['memory_density'],
-            'evolution_count': len(self.evolution_history),
+            'evolution_count': self._evolution_count,
             'top_patterns': self._get_top_patterns()[:5],
             'user_count': len(self.behavioral_memory['user_preferences'])
         }
-
-# Example demonstrating recursive memory evolution
-if __name__ == "__main__":
-    # Create a new recursive memory shell
-    memory = RecursiveMemoryShell(
-        prompt_id="prompt_001",
-        initial_template="As a {role}, help me {task} by {approach}"
-    )
-    
-    # Simulate interactions that teach the memory
-    for i in range(150):
-        interaction = {
-            'context': {
-                'role': ['consultant', 'advisor', 'expert'][i % 3],
-                'task': ['analyze', 'improve', 'design'][i % 3],
-                'approach': ['step-by-step', 'creatively', 'systematically'][i % 3]
-            },
-            'result': {
-                'success': 0.7 + (i / 1000),  # Improving over time
-                'execution_time': 2.0 - (i / 200),  # Getting faster
-                'response': f"Generated response {i}"
-            },
-            'user_id': f"user_{i % 10}"  # 10 different users
-        }
-        
-        memory_response = memory.remember(interaction)
-        
-        if i % 50 == 0:
-            print(f"Interaction {i}:")
-            print(f"  Memory depth: {memory_response['memory_depth']}")
-            print(f"  Evolution stage: {memory_response['evolution_stage']}")
-            print(f"  Current template: {memory.current_template}")
-            print()
-    
-    # Display final memory state
-    final_state = memory.get_memory_state()
-    print(f"
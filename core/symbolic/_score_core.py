@@ -0,0 +1,41 @@
+"""
+Scalar scoring core for the symbolic residue tracker.
+Plain typed floats. Nothing in this tree compiles it, so it runs interpreted;
+it stays mypyc-compatible in case a build ever adds that step.
+"""
+
+from math import exp
+from typing import Tuple
+
+# Kept free of dicts, NumPy and the tracker itself so mypyc could compile it as is
+
+# (semantic_score, structural_active, structural_total, temporal_score, emergence)
+ResidueInputs = Tuple[float, int, int, float, float]
+
+# Residue weights, shared with the tracker's vectorized batch scoring
+SEMANTIC_WEIGHT = 0.3
+STRUCTURAL_WEIGHT = 0.25
+TEMPORAL_WEIGHT = 0.25
+EMERGENCE_WEIGHT = 0.2
+
+def residue_strength(semantic_score: float, structural_active: int, structural_total: int,
+                     temporal_score: float, emergence: float) -> float:
+    """Weighted residue of semantic, structural, temporal and emergence scores"""
+    strength = 0.0
+    strength += min(semantic_score / 3, 1.0) * SEMANTIC_WEIGHT
+    strength += (structural_active / structural_total) * STRUCTURAL_WEIGHT
+    strength += temporal_score * TEMPORAL_WEIGHT
+    strength += emergence * EMERGENCE_WEIGHT
+    return strength
+
+def viral_probability(residue: float) -> float:
+    """Saturating map from residue strength to spread probability"""
+    return 1 - exp(-residue * 2)
+
+def estimated_reach(pattern_multiplier: float, residue: float) -> int:
+    """Audience estimate from compounded pattern count and residue strength"""
+    return int(100 * pattern_multiplier * residue)
+
+def longevity_score(semantic_depth: int, structural_depth: int) -> float:
+    """Staying power from how many distinct patterns a prompt carries"""
+    return (semantic_depth + structural_depth) / 10
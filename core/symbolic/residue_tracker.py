@@ -6,12 +6,93 @@ Inspired by TikTok's ability to detect what makes content resonate before users
 import numpy as np
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from collections import defaultdict
-import json
+from datetime import datetime, timezone
+from collections import Counter, OrderedDict
+from collections.abc import Mapping
 import hashlib
+import re
+import sys
+import time
+from math import exp, fsum
+from functools import lru_cache
 
-@dataclass
+from ._score_core import (
+    EMERGENCE_WEIGHT, SEMANTIC_WEIGHT, STRUCTURAL_WEIGHT, TEMPORAL_WEIGHT,
+    ResidueInputs, estimated_reach, longevity_score, residue_strength, viral_probability
+)
+
+# Distinct templates whose text-only analysis each tracker remembers
+TEMPLATE_CACHE_SIZE = 4096
+
+# Breakthrough indicators, in report order, and the threshold each must exceed
+BREAKTHROUGH_INDICATORS = ('high_residue_density', 'viral_threshold_exceeded', 'high_evolution_potential')
+BREAKTHROUGH_THRESHOLDS = (0.8, 0.7, 0.8)
+
+# Pattern signatures counted toward emergence before the stalest is forgotten
+MAX_PATTERN_COMBINATIONS = 100_000
+
+# Terms that leave a template open to interpretation, matched as whole words
+ABSTRACT_TERMS = frozenset(['concept', 'idea', 'thing', 'aspect', 'element', 'way'])
+_WORD_PATTERN = re.compile(r'[a-z]+')
+
+# Depth change for each bracket; everything else is skipped by the scan
+_BRACKET_PATTERN = re.compile(r'[\[\]{}]')
+_BRACKET_STEP = {'{': 1, '[': 1, '}': -1, ']': -1}
+
+def _mean(values) -> float:
+    """Exactly rounded mean of a small collection, 0.0 when empty"""
+    return fsum(values) / len(values) if values else 0.0
+
+def _nesting_depth(template: str) -> int:
+    """Deepest bracket nesting, one pass over the bracket characters only"""
+    depth = max_depth = 0
+    for bracket in _BRACKET_PATTERN.findall(template):
+        depth = max(depth + _BRACKET_STEP[bracket], 0)  # Stray closers don't go negative
+        if depth > max_depth:
+            max_depth = depth
+    return max_depth
+
+def _as_datetime64(times) -> np.ndarray:
+    """Timestamps as datetime64[s], from datetimes or epoch seconds"""
+    values = np.asarray(times)
+    if values.dtype.kind in 'iuf':  # Epoch seconds, rounded to whole seconds
+        return np.round(values.astype(np.float64)).astype(np.int64).astype('datetime64[s]')
+    if values.dtype.kind == 'O':
+        # numpy warns on aware datetimes, so hand it naive UTC ones
+        values = np.array([
+            t.astimezone(timezone.utc).replace(tzinfo=None)
+            if isinstance(t, datetime) and t.tzinfo is not None else t
+            for t in values.ravel()
+        ])
+    return values.astype('datetime64[s]')
+
+def _has_mirror(template: str) -> bool:
+    """Whether any line repeats itself across a '|', checked in linear time"""
+    if '|' not in template:
+        return False
+    for line in template.splitlines():
+        parts = [part.strip() for part in line.split('|')]
+        if any(left and left == right for left, right in zip(parts, parts[1:])):
+            return True
+    return False
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _scan_template(template: str) -> Dict[str, Any]:
+    """Every count the template analyzers read, taken once per template"""
+    template_lower = template.lower()
+    return {
+        'brace': template.count('{'),
+        'bracket': template.count('['),
+        'qmark': template.count('?'),
+        'ellipsis': template.count('...'),
+        'if': template.count('if '),
+        'lines': template.count('\n') + 1,
+        'word_count': len(template.split()),
+        'nesting_depth': _nesting_depth(template),
+        'abstract_count': sum(1 for word in _WORD_PATTERN.findall(template_lower) if word in ABSTRACT_TERMS)
+    }
+
+@dataclass(slots=True)
 class ResiduePattern:
     """
     Captures the intangible qualities that make prompts memorable.
@@ -22,11 +103,136 @@ class ResiduePattern:
     strength: float = 0.0
     emergence_count: int = 0
     viral_correlation: float = 0.0
-    first_seen: datetime = field(default_factory=datetime.utcnow)
+    first_seen: float = field(default_factory=time.time)  # Epoch seconds
+    
+    def __post_init__(self):
+        # A handful of types shared by every pattern: interning keeps one copy
+        # in memory, and its cached hash speeds up dict lookups keyed by type
+        self.pattern_type = sys.intern(self.pattern_type)
     
     def decay(self, hours_passed: float):
         """Patterns fade unless reinforced"""
-        self.strength *= np.exp(-hours_passed / 168)  # Week half-life
+        self.strength *= exp(-hours_passed / 168)  # Week half-life
+
+def _row_field(column: str, cast):
+    """Property reading and writing one field of a view's library row"""
+    def get(self):
+        return cast(getattr(self._library, column)[self._idx])
+    
+    def set(self, value):
+        getattr(self._library, column)[self._idx] = value
+        
+    return property(get, set)
+
+class ResiduePatternView:
+    """
+    One row of a ResidueLibrary, with ResiduePattern's fields and decay.
+    Writes go straight to the library, so `library[pid].strength += x` sticks.
+    """
+    __slots__ = ('_library', '_idx')
+    
+    def __init__(self, library: 'ResidueLibrary', idx: int):
+        self._library = library
+        self._idx = idx
+        
+    strength = _row_field('_strength', float)
+    emergence_count = _row_field('_emergence_count', int)
+    viral_correlation = _row_field('_viral_corr', float)
+    first_seen = _row_field('_first_seen', float)
+    
+    @property
+    def pattern_id(self) -> str:
+        return self._library._pattern_ids[self._idx]
+    
+    @property
+    def pattern_type(self) -> str:
+        return self._library._pattern_types[self._idx]
+    
+    @pattern_type.setter
+    def pattern_type(self, pattern_type: str):
+        self._library._pattern_types[self._idx] = sys.intern(pattern_type)
+        
+    def decay(self, hours_passed: float):
+        """Patterns fade unless reinforced"""
+        self.strength *= exp(-hours_passed / 168)  # Week half-life
+        
+    def __repr__(self) -> str:
+        return (
+            f"ResiduePatternView(pattern_id={self.pattern_id!r}, pattern_type={self.pattern_type!r}, "
+            f"strength={self.strength!r}, emergence_count={self.emergence_count!r}, "
+            f"viral_correlation={self.viral_correlation!r}, first_seen={self.first_seen!r})"
+        )
+
+class ResidueLibrary(Mapping):
+    """
+    The pattern library as parallel arrays, one row per pattern.
+    Reads hand out views that write through; sweeps touch every row at once.
+    """
+    
+    def __init__(self, capacity: int = 64):
+        self._pattern_ids: List[str] = []
+        self._pattern_types: List[str] = []
+        self._id_to_idx: Dict[str, int] = {}
+        self._strength = np.zeros(capacity, dtype=np.float32)
+        self._emergence_count = np.zeros(capacity, dtype=np.int32)
+        self._viral_corr = np.zeros(capacity, dtype=np.float32)
+        self._first_seen = np.zeros(capacity, dtype=np.float64)
+        
+    def __len__(self) -> int:
+        return len(self._pattern_ids)
+    
+    def __iter__(self):
+        return iter(self._pattern_ids)
+    
+    def __contains__(self, pattern_id: object) -> bool:
+        return pattern_id in self._id_to_idx
+    
+    def __getitem__(self, pattern_id: str) -> 'ResiduePatternView':
+        return ResiduePatternView(self, self._id_to_idx[pattern_id])
+    
+    def __setitem__(self, pattern_id: str, pattern: ResiduePattern):
+        """Store a pattern's fields, adding a row the first time an id is seen"""
+        idx = self._id_to_idx.get(pattern_id)
+        if idx is None:
+            idx = self._append(pattern_id, pattern.pattern_type)
+        self._pattern_types[idx] = pattern.pattern_type
+        self._strength[idx] = pattern.strength
+        self._emergence_count[idx] = pattern.emergence_count
+        self._viral_corr[idx] = pattern.viral_correlation
+        self._first_seen[idx] = pattern.first_seen
+        
+    def reinforce(self, pattern_id: str, pattern_type: str, strength_gain: float,
+                  viral_score: float, viral_alpha: float = 0.1, now: Optional[float] = None):
+        """Another sighting: add strength, count it, and fold in its viral score"""
+        idx = self._row(pattern_id, pattern_type, now)
+        self._strength[idx] += strength_gain
+        self._emergence_count[idx] += 1
+        self._viral_corr[idx] = self._viral_corr[idx] * (1 - viral_alpha) + viral_score * viral_alpha
+        
+    def decay_all(self, hours_passed: float):
+        """Fade every pattern at once, same week half-life as ResiduePattern.decay"""
+        self._strength[:len(self._pattern_ids)] *= np.float32(exp(-hours_passed / 168))
+        
+    def _row(self, pattern_id: str, pattern_type: str, now: Optional[float] = None) -> int:
+        """Row for a pattern, starting a fresh one in place on first sight"""
+        idx = self._id_to_idx.get(pattern_id)
+        if idx is None:
+            idx = self._append(pattern_id, pattern_type)
+            self._first_seen[idx] = time.time() if now is None else now
+        return idx
+    
+    def _append(self, pattern_id: str, pattern_type: str) -> int:
+        idx = len(self._pattern_ids)
+        if idx == len(self._strength):
+            grow = max(idx, 64)
+            self._strength = np.concatenate((self._strength, np.zeros(grow, dtype=np.float32)))
+            self._emergence_count = np.concatenate((self._emergence_count, np.zeros(grow, dtype=np.int32)))
+            self._viral_corr = np.concatenate((self._viral_corr, np.zeros(grow, dtype=np.float32)))
+            self._first_seen = np.concatenate((self._first_seen, np.zeros(grow, dtype=np.float64)))
+        self._id_to_idx[pattern_id] = idx
+        self._pattern_ids.append(pattern_id)
+        self._pattern_types.append(sys.intern(pattern_type))
+        return idx
 
 class SymbolicResidueTracker:
     """
@@ -36,23 +242,41 @@ class SymbolicResidueTracker:
     
     def __init__(self):
         # Pattern library learned from successful prompts
-        self.residue_patterns = defaultdict(ResiduePattern)
+        self.residue_patterns = ResidueLibrary()
         
-        # Semantic hooks that trigger engagement
-        self.semantic_triggers = {
+        # Semantic hooks that trigger engagement (lowercased once, matched
+        # against the lowercased template)
+        semantic_triggers = {
             'curiosity_gap': ['discover', 'reveal', 'hidden', 'secret'],
             'identity_mirror': ['you are', 'become', 'transform', 'embody'],
             'cognitive_ease': ['simply', 'just', 'easily', 'naturally'],
             'social_proof': ['everyone', 'trending', 'viral', 'popular'],
             'scarcity_driver': ['limited', 'exclusive', 'rare', 'special']
         }
+        self.semantic_triggers = {
+            hook_type: [trigger.lower() for trigger in triggers]
+            for hook_type, triggers in semantic_triggers.items()
+        }
+        
+        # Every trigger in one zero-width alternation, so a single scan finds
+        # each place a trigger starts, overlapping ones included
+        self._trigger_groups = {}
+        alternatives = []
+        for hook_type, triggers in self.semantic_triggers.items():
+            for trigger in triggers:
+                group = f"t{len(self._trigger_groups)}"
+                self._trigger_groups[group] = hook_type
+                alternatives.append(f"(?P<{group}>{re.escape(trigger)})")
+        self._trigger_regex = re.compile('(?=' + '|'.join(alternatives) + ')')
         
-        # Structural patterns that enhance memorability
+        # Structural patterns that enhance memorability (compiled once;
+        # mirror_structure is checked directly, a backreference can backtrack badly)
         self.structural_signatures = {
-            'triadic_rhythm': r'(\w+)[,\s]+(\w+)[,\s]+and\s+(\w+)',
-            'question_cascade': r'(\?.*){2,}',
-            'mirror_structure': r'(.+)\s*\|\s*\1',
-            'recursive_reference': r'(this|self|itself)\s+(prompt|template|pattern)'
+            name: re.compile(regex) for name, regex in {
+                'triadic_rhythm': r'(\w+)[,\s]+(\w+)[,\s]+and\s+(\w+)',
+                'question_cascade': r'(\?.*){2,}',
+                'recursive_reference': r'(this|self|itself)\s+(prompt|template|pattern)'
+            }.items()
         }
         
         # Temporal patterns that drive engagement
@@ -62,9 +286,17 @@ class SymbolicResidueTracker:
             'cascade_intervals': [1, 7, 30]  # Days for remix waves
         }
         
+        # Hour-of-day lookup for the prime time windows
+        self._prime_hours = np.zeros(24, dtype=bool)
+        for start, end in self.temporal_dynamics['prime_time_windows']:
+            self._prime_hours[start:end] = True
+        
         # Emergent pattern detection
         self.emergence_threshold = 5  # Occurrences before pattern recognition
-        self.pattern_combinations = defaultdict(int)
+        self.pattern_combinations = OrderedDict()  # LRU, bounded by MAX_PATTERN_COMBINATIONS
+        
+        # Text-only analysis, memoised per tracker since remixes resubmit templates
+        self._template_analysis = lru_cache(maxsize=TEMPLATE_CACHE_SIZE)(self._analyze_template)
         
         # Success correlation tracking
         self.success_indicators = {
@@ -79,94 +311,205 @@ class SymbolicResidueTracker:
         Extract symbolic residue from prompt interaction.
         Find the patterns that consciousness remembers.
         """
+        residue_analysis = self._collect_residue(prompt_data)
+        
+        # Calculate overall residue strength
+        residue_analysis['total_residue'] = self._calculate_residue_strength(residue_analysis)
+        
+        return residue_analysis
+    
+    def analyze_many(self, prompts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Extract residue from a batch of prompts, like a whole feed.
+        Same results as analyze_prompt in turn; strengths are scored as columns.
+        """
+        analyses = [self._collect_residue(prompt_data) for prompt_data in prompts]
+        if not analyses:
+            return analyses
+        
+        inputs = np.array([self._residue_inputs(analysis) for analysis in analyses], dtype=np.float64)
+        semantic, structural_active, structural_total, temporal, emergence = inputs.T
+        
+        # Same terms, weights and order as residue_strength, so totals match exactly
+        totals = np.minimum(semantic / 3, 1.0) * SEMANTIC_WEIGHT
+        totals += (structural_active / structural_total) * STRUCTURAL_WEIGHT
+        totals += temporal * TEMPORAL_WEIGHT
+        totals += emergence * EMERGENCE_WEIGHT
+        
+        for analysis, total in zip(analyses, totals.tolist()):
+            analysis['total_residue'] = total
+        return analyses
+    
+    def _collect_residue(self, prompt_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Everything in a residue analysis except its overall strength.
+        Also teaches the pattern library, so prompts must arrive in order.
+        """
+        now = time.time()  # One clock read, shared by everything stamped below
         template = prompt_data.get('template', '')
         metrics = prompt_data.get('metrics', {})
+        semantic_hooks, structural_patterns, flexibility, openness = self._template_analysis(template)
         
         residue_analysis = {
-            'semantic_hooks': self._detect_semantic_hooks(template),
-            'structural_patterns': self._detect_structural_patterns(template),
-            'temporal_resonance': self._analyze_temporal_resonance(prompt_data),
-            'emergence_potential': self._calculate_emergence_potential(prompt_data),
+            'semantic_hooks': dict(semantic_hooks),  # Copies, the cached ones are shared
+            'structural_patterns': dict(structural_patterns),
+            'temporal_resonance': self._analyze_temporal_resonance(prompt_data, now),
+            'emergence_potential': self._calculate_emergence_potential(prompt_data, flexibility, openness),
             'viral_indicators': self._extract_viral_indicators(metrics)
         }
         
         # Detect novel patterns
-        novel_patterns = self._discover_novel_patterns(template, metrics)
+        novel_patterns = self._discover_novel_patterns(template, metrics, now)
         if novel_patterns:
             residue_analysis['novel_discoveries'] = novel_patterns
         
-        # Calculate overall residue strength
-        residue_analysis['total_residue'] = self._calculate_residue_strength(residue_analysis)
-        
         # Update pattern library
-        self._update_pattern_library(residue_analysis, metrics)
+        self._update_pattern_library(residue_analysis, metrics, now)
         
         return residue_analysis
     
-    def _detect_semantic_hooks(self, template: str) -> Dict[str, float]:
+    def _analyze_template(self, template: str) -> Tuple[Dict[str, float], Dict[str, Any], float, float]:
+        """
+        Everything that depends on the template text alone.
+        Hooks, structure, flexibility and openness, computed once per template.
+        """
+        template_lower = template.lower()  # Shared by every case-insensitive check
+        word_count = _scan_template(template)['word_count']  # Split once, not per helper
+        return (
+            self._detect_semantic_hooks(template, template_lower, word_count),
+            self._detect_structural_patterns(template, word_count),
+            self._measure_template_flexibility(template),
+            self._calculate_semantic_openness(template)
+        )
+    
+    def _detect_semantic_hooks(self, template: str, template_lower: Optional[str] = None,
+                               word_count: Optional[int] = None) -> Dict[str, float]:
         """
         Find semantic triggers that create cognitive adhesion.
         What makes a prompt stick in memory?
         """
+        if template_lower is None:
+            template_lower = template.lower()
+        if word_count is None:
+            word_count = _scan_template(template)['word_count']
         hooks = {}
         
-        for hook_type, triggers in self.semantic_triggers.items():
-            score = 0.0
-            for trigger in triggers:
-                if trigger.lower() in template.lower():
-                    score += 1.0
-                    
+        # Each distinct trigger present scores once for its hook
+        found = {match.lastgroup for match in self._trigger_regex.finditer(template_lower)}
+        scores = Counter(self._trigger_groups[group] for group in found)
+        
+        for hook_type in self.semantic_triggers:
+            score = float(scores[hook_type])
             if score > 0:
                 # Normalize by template length
-                hooks[hook_type] = score / (len(template.split()) / 100)
+                hooks[hook_type] = score / (word_count / 100)
         
         return hooks
     
-    def _detect_structural_patterns(self, template: str) -> Dict[str, bool]:
+    def _detect_structural_patterns(self, template: str, word_count: Optional[int] = None) -> Dict[str, bool]:
         """
         Identify structural elements that enhance virality.
         Like TikTok's duet format or Airbnb's photo gallery order.
         """
-        import re
-        
         patterns = {}
         
-        for pattern_name, regex in self.structural_signatures.items():
-            patterns[pattern_name] = bool(re.search(regex, template))
+        for pattern_name, compiled in self.structural_signatures.items():
+            patterns[pattern_name] = compiled.search(template) is not None
+        patterns['mirror_structure'] = _has_mirror(template)
             
         # Additional structural analysis
-        lines = template.split('\n')
-        patterns['line_symmetry'] = len(lines) in [3, 5, 7]  # Odd numbers feel complete
-        patterns['variable_density'] = template.count('{') / len(template.split())
-        patterns['nested_depth'] = self._calculate_nesting_depth(template)
+        counts = _scan_template(template)
+        if word_count is None:
+            word_count = counts['word_count']
+        patterns['line_symmetry'] = counts['lines'] in [3, 5, 7]  # Odd numbers feel complete
+        patterns['variable_density'] = counts['brace'] / word_count
+        patterns['nested_depth'] = counts['nesting_depth']
         
         return patterns
     
-    def _analyze_temporal_resonance(self, prompt_data: Dict[str, Any]) -> Dict[str, float]:
+    def _analyze_temporal_resonance(self, prompt_data: Dict[str, Any],
+                                    now: Optional[float] = None) -> Dict[str, float]:
         """
         How timing affects viral spread.
         When do patterns achieve maximum resonance?
         """
-        created_at = prompt_data.get('created_at', datetime.utcnow())
-        usage_times = prompt_data.get('usage_times', [])
+        created_at = prompt_data.get('created_at')
+        if created_at is None:
+            created_at = time.time() if now is None else now
+        if not isinstance(created_at, datetime):
+            created_at = datetime.fromtimestamp(created_at, timezone.utc)
+        # Convert once; every usage statistic below is int64 arithmetic on this
+        usage_times = _as_datetime64(prompt_data.get('usage_times', []))
         
         resonance = {
             'launch_timing': self._calculate_launch_timing_score(created_at),
             'usage_velocity': self._calculate_usage_velocity(usage_times),
-            'remix_cascade': self._analyze_remix_timing(prompt_data.get('remix_times', [])),
+            'remix_cascade': self._analyze_remix_timing(_as_datetime64(prompt_data.get('remix_times', []))),
             'temporal_clustering': self._detect_temporal_clusters(usage_times)
         }
         
         return resonance
     
-    def _calculate_emergence_potential(self, prompt_data: Dict[str, Any]) -> float:
+    def _calculate_launch_timing_score(self, created_at: datetime) -> float:
+        """
+        Whether a prompt was born inside a prime time window.
+        Launch when the audience is listening.
+        """
+        return 1.0 if self._prime_hours[created_at.hour] else 0.5
+    
+    def _calculate_usage_velocity(self, usage_times: np.ndarray) -> float:
+        """
+        Uses per minute over the observed span, against the viral threshold.
+        Momentum is what turns a prompt into a wave.
+        """
+        if len(usage_times) < 2:
+            return 0.0
+        
+        span_seconds = int((usage_times.max() - usage_times.min()).astype(np.int64))
+        if span_seconds <= 0:
+            return 1.0
+        
+        uses_per_minute = len(usage_times) * 60 / span_seconds
+        return min(uses_per_minute / self.temporal_dynamics['viral_velocity_threshold'], 1.0)
+    
+    def _analyze_remix_timing(self, remix_times: np.ndarray) -> float:
+        """
+        Share of the cascade intervals that remixing kept going through.
+        A remix wave that lasts a month outlived the novelty.
+        """
+        if not len(remix_times):
+            return 0.0
+        
+        span_days = int((remix_times.max() - remix_times.min()).astype(np.int64)) / 86400
+        intervals = self.temporal_dynamics['cascade_intervals']
+        return sum(1 for days in intervals if span_days >= days) / len(intervals)
+    
+    def _detect_temporal_clusters(self, usage_times: np.ndarray) -> float:
+        """
+        Share of usage falling inside the prime time windows.
+        Attention gathers at the same hours each day.
+        """
+        if not len(usage_times):
+            return 0.0
+        
+        hours = usage_times.astype('datetime64[h]').astype(np.int64) % 24
+        return float(self._prime_hours[hours].mean())
+    
+    def _calculate_emergence_potential(self, prompt_data: Dict[str, Any],
+                                       flexibility: Optional[float] = None,
+                                       openness: Optional[float] = None) -> float:
         """
         Predict if this prompt will spawn new patterns.
         Like how "challenge" videos created a new genre on TikTok.
         """
+        if flexibility is None:
+            flexibility = self._measure_template_flexibility(prompt_data['template'])
+        if openness is None:
+            openness = self._calculate_semantic_openness(prompt_data['template'])
+            
         factors = {
-            'template_flexibility': self._measure_template_flexibility(prompt_data['template']),
-            'semantic_openness': self._calculate_semantic_openness(prompt_data['template']),
+            'template_flexibility': flexibility,
+            'semantic_openness': openness,
             'remix_variance': self._analyze_remix_variance(prompt_data.get('children', [])),
             'cross_domain_appeal': self._estimate_cross_domain_potential(prompt_data)
         }
@@ -186,33 +529,77 @@ class SymbolicResidueTracker:
         
         return emergence_score
     
-    def _discover_novel_patterns(self, template: str, metrics: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _analyze_remix_variance(self, children: List[Any]) -> float:
+        """
+        How far remixes wander from each other, damped until there are five.
+        Identical forks copy a prompt; varied ones extend it.
+        """
+        if not children:
+            return 0.0
+        
+        templates = {
+            child.get('template', '') if isinstance(child, dict) else str(child)
+            for child in children
+        }
+        return len(templates) / len(children) * min(len(children) / 5, 1.0)
+    
+    def _estimate_cross_domain_potential(self, prompt_data: Dict[str, Any]) -> float:
+        """
+        Share of the hook families a template pulls on at once.
+        Prompts that speak to several instincts travel between communities.
+        """
+        semantic_hooks = self._template_analysis(prompt_data.get('template', ''))[0]
+        return len(semantic_hooks) / len(self.semantic_triggers)
+    
+    def _extract_viral_indicators(self, metrics: Dict[str, Any]) -> Dict[str, float]:
+        """
+        The spread signals already visible in a prompt's metrics.
+        Plain floats, so an analysis serializes as is.
+        """
+        usage_count = metrics.get('usage_count', 0)
+        effectiveness = metrics.get('effectiveness_score', 0.5)
+        return {
+            'viral_coefficient': float(metrics.get('viral_coefficient', 0.0)),
+            'remix_rate': metrics.get('remix_count', 0) / max(usage_count, 1),
+            'high_completion': 1.0 if effectiveness >= self.success_indicators['high_completion'] else 0.0
+        }
+    
+    def _discover_novel_patterns(self, template: str, metrics: Dict[str, Any],
+                                 now: Optional[float] = None) -> List[Dict[str, Any]]:
         """
         Detect emerging patterns not yet in our library.
         The next viral mechanic might be hiding in plain sight.
         """
         novel_patterns = []
         
-        # Generate pattern hash
-        pattern_elements = [
+        # Pattern signature, counted by the tuple itself (hashed in C)
+        counts = _scan_template(template)
+        pattern_key = (
             template[:50],  # Beginning structure
-            str(template.count('{')),  # Variable density
-            str(len(template.split())),  # Length category
-            str(metrics.get('effectiveness_score', 0) > 0.8)  # High performance
-        ]
-        
-        pattern_hash = hashlib.md5('|'.join(pattern_elements).encode()).hexdigest()[:8]
+            counts['brace'],  # Variable density
+            counts['word_count'],  # Length category
+            metrics.get('effectiveness_score', 0) > 0.8  # High performance
+        )
         
         # Check if pattern is emerging
-        self.pattern_combinations[pattern_hash] += 1
-        
-        if self.pattern_combinations[pattern_hash] == self.emergence_threshold:
+        combinations = self.pattern_combinations
+        occurrences = combinations.get(pattern_key, 0) + 1
+        combinations[pattern_key] = occurrences
+        combinations.move_to_end(pattern_key)
+        if len(combinations) > MAX_PATTERN_COMBINATIONS:
+            combinations.popitem(last=False)
+        
+        if occurrences == self.emergence_threshold:
+            # Only an emerged pattern needs a stable, printable id
+            if now is None:
+                now = time.time()
+            pattern_hash = hashlib.md5('|'.join(map(str, pattern_key)).encode()).hexdigest()[:8]
             novel_patterns.append({
                 'pattern_id': pattern_hash,
                 'template_signature': template[:100],
                 'emergence_count': self.emergence_threshold,
                 'first_metrics': metrics,
-                'discovery_time': datetime.utcnow()
+                'discovery_time': now
             })
             
             # Add to pattern library
@@ -220,7 +607,8 @@ class SymbolicResidueTracker:
                 pattern_id=pattern_hash,
                 pattern_type='emergent',
                 strength=1.0,
-                emergence_count=self.emergence_threshold
+                emergence_count=self.emergence_threshold,
+                first_seen=now
             )
         
         return novel_patterns
@@ -230,26 +618,22 @@ class SymbolicResidueTracker:
         Overall measure of a prompt's sticky quality.
         What makes something impossible to forget?
         """
-        strength = 0.0
-        
-        # Semantic hook contribution
-        semantic_score = sum(analysis['semantic_hooks'].values())
-        strength += min(semantic_score / 3, 1.0) * 0.3
-        
-        # Structural pattern contribution
-        structural_score = sum(1 for v in analysis['structural_patterns'].values() if v)
-        strength += (structural_score / len(analysis['structural_patterns'])) * 0.25
-        
-        # Temporal resonance contribution
-        temporal_score = np.mean(list(analysis['temporal_resonance'].values()))
-        strength += temporal_score * 0.25
-        
-        # Emergence potential contribution
-        strength += analysis['emergence_potential'] * 0.2
-        
-        return strength
+        # The weighting itself lives in _score_core
+        return residue_strength(*self._residue_inputs(analysis))
+    
+    def _residue_inputs(self, analysis: Dict[str, Any]) -> ResidueInputs:
+        """The analysis reduced to the plain numbers the scoring core takes"""
+        structural_patterns = analysis['structural_patterns']
+        return (
+            sum(analysis['semantic_hooks'].values()),
+            sum(1 for v in structural_patterns.values() if v),
+            len(structural_patterns),
+            _mean(analysis['temporal_resonance'].values()),
+            analysis['emergence_potential']
+        )
     
-    def _update_pattern_library(self, analysis: Dict[str, Any], metrics: Dict[str, Any]):
+    def _update_pattern_library(self, analysis: Dict[str, Any], metrics: Dict[str, Any],
+                                now: Optional[float] = None):
         """
         Learn from successful patterns.
         Successful patterns teach us what consciousness craves.
@@ -261,19 +645,13 @@ class SymbolicResidueTracker:
         if effectiveness > 0.7:
             for hook_type, score in analysis['semantic_hooks'].items():
                 if score > 0:
-                    pattern_key = f"semantic:{hook_type}"
-                    if pattern_key not in self.residue_patterns:
-                        self.residue_patterns[pattern_key] = ResiduePattern(
-                            pattern_id=pattern_key,
-                            pattern_type='semantic'
-                        )
-                    
-                    pattern = self.residue_patterns[pattern_key]
-                    pattern.strength += score * effectiveness
-                    pattern.emergence_count += 1
-                    pattern.viral_correlation = (
-                        pattern.viral_correlation * 0.9 + 
-                        viral_score * 0.1
+                    # One lookup; unseen hooks get their row without a
+                    # throwaway ResiduePattern
+                    self.residue_patterns.reinforce(
+                        f"semantic:{hook_type}", 'semantic',
+                        strength_gain=score * effectiveness,
+                        viral_score=viral_score,
+                        now=now
                     )
     
     def _measure_template_flexibility(self, template: str) -> float:
@@ -281,9 +659,10 @@ class SymbolicResidueTracker:
         How adaptable is this template to different contexts?
         Like how "duet" format works for any content type.
         """
-        variable_count = template.count('{')
-        optional_sections = template.count('[')
-        conditional_logic = template.count('if ')
+        counts = _scan_template(template)
+        variable_count = counts['brace']
+        optional_sections = counts['bracket']
+        conditional_logic = counts['if']
         
         flexibility = (
             min(variable_count / 5, 1.0) * 0.4 +
@@ -298,13 +677,11 @@ class SymbolicResidueTracker:
         How much interpretation space does the template leave?
         Open-ended templates spawn more creative derivatives.
         """
-        abstract_terms = ['concept', 'idea', 'thing', 'aspect', 'element', 'way']
-        open_questions = template.count('?')
-        ellipses = template.count('...')
+        counts = _scan_template(template)
+        open_questions = counts['qmark']
+        ellipses = counts['ellipsis']
         
-        openness = 0.0
-        for term in abstract_terms:
-            openness += template.lower().count(term) * 0.1
+        openness = counts['abstract_count'] * 0.1
             
         openness += min(open_questions / 3, 1.0) * 0.3
         openness += min(ellipses / 2, 1.0) * 0.2
@@ -324,10 +701,10 @@ class SymbolicResidueTracker:
             'breakthrough_indicators': []
         }
         
-        residue_strength = prompt_analysis.get('total_residue', 0)
+        residue = prompt_analysis.get('total_residue', 0)
         
         # Base viral probability on residue strength
-        prediction['viral_probability'] = 1 - np.exp(-residue_strength * 2)
+        prediction['viral_probability'] = viral_probability(residue)
         
         # Estimate reach based on pattern combinations
         pattern_multiplier = 1.0
@@ -336,7 +713,7 @@ class SymbolicResidueTracker:
                 active_patterns = sum(1 for v in prompt_analysis[pattern_type].values() if v)
                 pattern_multiplier *= (1 + active_patterns * 0.2)
         
-        prediction['estimated_reach'] = int(100 * pattern_multiplier * residue_strength)
+        prediction['estimated_reach'] = estimated_reach(pattern_multiplier, residue)
         
         # Remix potential based on flexibility and openness
         if 'emergence_potential' in prompt_analysis:
@@ -345,40 +722,13 @@ class SymbolicResidueTracker:
         # Longevity based on pattern depth
         semantic_depth = len(prompt_analysis.get('semantic_hooks', {}))
         structural_depth = sum(1 for v in prompt_analysis.get('structural_patterns', {}).values() if v)
-        prediction['longevity_score'] = (semantic_depth + structural_depth) / 10
+        prediction['longevity_score'] = longevity_score(semantic_depth, structural_depth)
         
         # Identify breakthrough indicators
-        if residue_strength > 0.8:
-            prediction['breakthrough_indicators'].append('high_residue_density')
-        if prediction['viral_probability'] > 0.7:
-            prediction['breakthrough_indicators'].append('viral_threshold_exceeded')
-        if prediction['remix_potential'] > 0.8:
-            prediction['breakthrough_indicators'].append('high_evolution_potential')
+        values = (residue, prediction['viral_probability'], prediction['remix_potential'])
+        prediction['breakthrough_indicators'] = [
+            name for name, value, threshold in zip(BREAKTHROUGH_INDICATORS, values, BREAKTHROUGH_THRESHOLDS)
+            if value > threshold
+        ]
             
         return prediction
-
-# Example usage demonstrating viral pattern detection
-if __name__ == "__main__":
-    tracker = SymbolicResidueTracker()
-    
-    # Analyze a potentially viral prompt
-    prompt_data = {
-        'template': "You are a {role} who {action}. But here's the twist: {constraint}. Now {challenge}...",
-        'metrics': {
-            'effectiveness_score': 0.85,
-            'viral_coefficient': 0.12,
-            'usage_count': 150,
-            'remix_count': 18
-        },
-        'created_at': datetime.utcnow() - timedelta(hours=3),
-        'usage_times': [datetime.utcnow() - timedelta(minutes=i*10) for i in range(20)]
-    }
-    
-    # Extract residue patterns
-    analysis = tracker.analyze_prompt(prompt_data)
-    
-    # Predict viral potential
-    prediction = tracker.predict_viral_potential(analysis)
-    
-    print(f"Residue Analysis: {json.dumps(analysis, indent=2, default=str)}")
-    print(f"Viral Prediction: {json.dumps(prediction, indent=2)}")
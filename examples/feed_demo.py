@@ -0,0 +1,32 @@
+"""
+Feed algorithm demo: interactions feeding the trending patterns.
+Run from the repository root with `python -m examples.feed_demo`.
+"""
+
+from core.feed.algorithm import FeedAlgorithm
+
+# Usage example showing viral mechanics
+if __name__ == "__main__":
+    algorithm = FeedAlgorithm()
+    
+    # User interacts with prompts
+    algorithm.record_interaction(
+        user_id="user_123",
+        prompt_id="prompt_456",
+        interaction_type="use",
+        metadata={'satisfaction': 0.9}
+    )
+    
+    # User creates a remix
+    algorithm.record_interaction(
+        user_id="user_123",
+        prompt_id="prompt_456",
+        interaction_type="remix",
+        metadata={'modifications': 'minor'}
+    )
+    
+    # Get personalized feed
+    feed = algorithm.get_feed("user_123", count=20)
+    
+    # Track what goes viral
+    print(f"Trending prompts: {list(algorithm.trending_patterns.keys())[:5]}")
@@ -0,0 +1,43 @@
+"""
+Recursive memory demo: a prompt learning from 150 interactions.
+Run from the repository root with `python -m examples.memory_demo`.
+"""
+
+from core.memory.recursive_shell import RecursiveMemoryShell
+
+# Example demonstrating recursive memory evolution
+if __name__ == "__main__":
+    # Create a new recursive memory shell
+    memory = RecursiveMemoryShell(
+        prompt_id="prompt_001",
+        initial_template="As a {role}, help me {task} by {approach}"
+    )
+    
+    # Simulate interactions that teach the memory
+    for i in range(150):
+        interaction = {
+            'context': {
+                'role': ['consultant', 'advisor', 'expert'][i % 3],
+                'task': ['analyze', 'improve', 'design'][i % 3],
+                'approach': ['step-by-step', 'creatively', 'systematically'][i % 3]
+            },
+            'result': {
+                'success': 0.7 + (i / 1000),  # Improving over time
+                'execution_time': 2.0 - (i / 200),  # Getting faster
+                'response': f"Generated response {i}"
+            },
+            'user_id': f"user_{i % 10}"  # 10 different users
+        }
+        
+        memory_response = memory.remember(interaction)
+        
+        if i % 50 == 0:
+            print(f"Interaction {i}:")
+            print(f"  Memory depth: {memory_response.memory_depth}")
+            print(f"  Evolution stage: {memory_response.evolution_stage}")
+            print(f"  Current template: {memory.current_template}")
+            print()
+    
+    # Display final memory state
+    final_state = memory.get_memory_state()
+    print(f"Final memory state: {final_state}")
@@ -0,0 +1,49 @@
+"""
+Prompt shell demo: a remix going viral and paying its original creator.
+Run from the repository root with `python -m examples.prompt_shell_demo`.
+"""
+
+from core.engine.prompt_shell import PromptShell
+
+# Example usage pattern that demonstrates virality
+if __name__ == "__main__":
+    # Creator makes original prompt
+    original = PromptShell(
+        creator_id="creator_123",
+        template="You are a {role} helping with {task}. Start by {approach}."
+    )
+    
+    # User tries it
+    result = original.execute(
+        context={
+            'role': 'startup mentor',
+            'task': 'finding product-market fit',
+            'approach': 'understanding the problem deeply'
+        },
+        user_id="user_456"
+    )
+    
+    # User loves it, creates a remix
+    remix = original.fork(
+        new_creator_id="user_456",
+        modifications={
+            'append': "Focus especially on customer pain points."
+        }
+    )
+    
+    # Remix goes viral
+    for i in range(100):
+        remix.execute(
+            context={
+                'role': 'growth advisor',
+                'task': 'scaling user acquisition',
+                'approach': 'analyzing current metrics'
+            },
+            user_id=f"user_{i}"
+        )
+    
+    # Original creator earns from derivative success
+    print(f"Original effectiveness: {original.effectiveness_score}")
+    print(f"Remix effectiveness: {remix.effectiveness_score}")
+    print(f"Original viral coefficient: {original.viral_coefficient}")
+    print(f"Creator earnings: ${original.total_earned}")
@@ -0,0 +1,35 @@
+"""
+Symbolic residue demo: scoring one prompt for viral potential.
+Run from the repository root with `python -m examples.residue_demo`.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+from core.symbolic.residue_tracker import SymbolicResidueTracker
+
+# Example usage demonstrating viral pattern detection
+if __name__ == "__main__":
+    tracker = SymbolicResidueTracker()
+    
+    # Analyze a potentially viral prompt
+    prompt_data = {
+        'template': "You are a {role} who {action}. But here's the twist: {constraint}. Now {challenge}...",
+        'metrics': {
+            'effectiveness_score': 0.85,
+            'viral_coefficient': 0.12,
+            'usage_count': 150,
+            'remix_count': 18
+        },
+        'created_at': datetime.utcnow() - timedelta(hours=3),
+        'usage_times': [datetime.utcnow() - timedelta(minutes=i*10) for i in range(20)]
+    }
+    
+    # Extract residue patterns
+    analysis = tracker.analyze_prompt(prompt_data)
+    
+    # Predict viral potential
+    prediction = tracker.predict_viral_potential(analysis)
+    
+    print(f"Residue Analysis: {json.dumps(analysis, indent=2)}")
+    print(f"Viral Prediction: {json.dumps(prediction, indent=2)}")
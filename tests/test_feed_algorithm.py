@@ -0,0 +1,169 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core.feed import algorithm as feed_algorithm
+from core.feed.algorithm import (
+    EXPLORATION_POOL_TTL, INTERACTION_TYPE_IDS, InteractionLog, INTERACTION_TYPES, TRENDING_DECAY, TRENDING_FLOOR,
+    TRENDING_SWEEP_INTERVAL, FeedAlgorithm, _TRENDING_WEIGHTS
+)
+
+
+def test_set_weights_updates_scoring_weights():
+    algorithm = FeedAlgorithm()
+    algorithm.set_weights(novelty=0.5)
+    
+    assert algorithm.recommendation_weights['novelty'] == 0.5
+    assert algorithm._weights[algorithm._factor_order.index('novelty')] == 0.5
+
+
+def test_recommendation_weights_reject_direct_mutation():
+    algorithm = FeedAlgorithm()
+    
+    with pytest.raises(TypeError):
+        algorithm.recommendation_weights['novelty'] = 0.5
+    with pytest.raises(KeyError):
+        algorithm.set_weights(popularity=1.0)
+
+
+def _eager_trending(stream):
+    """The original per-event decay over a plain dict, as the reference"""
+    patterns = {}
+    for prompt_id, interaction_type in stream:
+        patterns[prompt_id] = patterns.get(prompt_id, 0.0) + _TRENDING_WEIGHTS[INTERACTION_TYPE_IDS[interaction_type]]
+        for pid in list(patterns):
+            patterns[pid] *= TRENDING_DECAY
+            if patterns[pid] < TRENDING_FLOOR:
+                del patterns[pid]
+    return patterns
+
+
+def test_trending_matches_eager_decay_across_sweeps():
+    rng = random.Random(7)
+    # Early prompts go quiet partway through, so sweeps must evict them
+    stream = [
+        (f"prompt_{rng.randrange(40) if i < 1500 else 20 + rng.randrange(20)}", rng.choice(INTERACTION_TYPES))
+        for i in range(3 * TRENDING_SWEEP_INTERVAL + 100)
+    ]
+    algorithm = FeedAlgorithm()
+    for prompt_id, interaction_type in stream:
+        algorithm._update_trending_patterns(prompt_id, INTERACTION_TYPE_IDS[interaction_type])
+    expected = _eager_trending(stream)
+    
+    assert algorithm.trending_patterns == pytest.approx(expected)
+    assert len(algorithm._trend_ids) < 40  # Faded prompts were compacted away
+    top = algorithm.get_top_trending(10)
+    assert [pid for pid, _ in top] == sorted(expected, key=expected.get, reverse=True)[:10]
+    assert [score for _, score in top] == pytest.approx(sorted(expected.values(), reverse=True)[:10])
+
+
+def _prompt(name, creator, template="plain prompt"):
+    return {'id': name, 'creator_id': creator, 'template': template}
+
+
+def test_diversity_filter_caps_creators_and_categories_in_rank_order():
+    ranked = [
+        _prompt('a1', 'alice'), _prompt('a2', 'alice'), _prompt('a3', 'alice'),
+        *[_prompt(f"code{i}", f"dev{i}", "write code") for i in range(7)],
+        _prompt('b1', 'bob'), _prompt('c1', 'carol')
+    ]
+    scored = [(1.0 - i / 100, prompt) for i, prompt in enumerate(ranked)]
+    
+    selected = FeedAlgorithm()._apply_diversity_filter(iter(scored), target_count=9)
+    
+    # a3 is over alice's cap, code5 and code6 over the technical cap;
+    # lower-ranked prompts backfill their places, still in rank order
+    assert [p['id'] for p in selected] == ['a1', 'a2', 'code0', 'code1', 'code2', 'code3', 'code4', 'b1', 'c1']
+
+
+def test_diversity_filter_stops_at_target_count():
+    ranked = [(1.0, _prompt(f"p{i}", f"creator{i}", "tell a story")) for i in range(3)]
+    
+    assert len(FeedAlgorithm()._apply_diversity_filter(iter(ranked), target_count=2)) == 2
+
+
+def _algorithm_with_pool(monkeypatch, pool):
+    algorithm = FeedAlgorithm()
+    loads = []
+    
+    def load_pool():
+        loads.append(1)
+        return pool
+    
+    monkeypatch.setattr(algorithm, '_load_exploration_pool', load_pool)
+    return algorithm, loads
+
+
+def test_exploration_fills_distinct_slots_without_repeating_ranked_prompts(monkeypatch):
+    ranked = [_prompt(f"r{i}", f"creator{i}") for i in range(20)]
+    pool = ranked[:5] + [_prompt(f"x{i}", 'explorer') for i in range(3)]
+    algorithm, _ = _algorithm_with_pool(monkeypatch, pool)
+    
+    for _ in range(50):
+        feed = algorithm._inject_exploration(list(ranked), target_count=20)
+        ids = [p['id'] for p in feed]
+        
+        assert len(ids) == 20 and len(set(ids)) == 20
+        assert sum(i.startswith('x') for i in ids) == 2  # Two distinct slots replaced
+
+
+def test_exploration_fills_empty_slots_first(monkeypatch):
+    ranked = [_prompt(f"r{i}", f"creator{i}") for i in range(9)]
+    algorithm, _ = _algorithm_with_pool(monkeypatch, [_prompt(f"x{i}", 'explorer') for i in range(3)])
+    
+    feed = algorithm._inject_exploration(list(ranked), target_count=10)
+    
+    assert len(feed) == 10 and feed[9]['id'].startswith('x')
+    assert sum(p['id'].startswith('r') for p in feed) == 8  # One appended, one replaced
+
+
+def test_exploration_pool_reloads_only_after_ttl(monkeypatch):
+    algorithm, loads = _algorithm_with_pool(monkeypatch, [_prompt('x', 'explorer')])
+    clock = [1000.0]
+    monkeypatch.setattr(feed_algorithm.time, 'time', lambda: clock[0])
+    
+    algorithm._get_exploration_candidates(2)
+    clock[0] += EXPLORATION_POOL_TTL
+    algorithm._get_exploration_candidates(2)
+    assert len(loads) == 1
+    
+    clock[0] += 1.0
+    algorithm._get_exploration_candidates(2)
+    assert len(loads) == 2
+
+
+def test_created_at_converts_aware_datetimes_to_epoch():
+    algorithm = FeedAlgorithm()
+    naive_utc = datetime(2024, 1, 1, 8)
+    aware = datetime(2024, 1, 1, 10, tzinfo=timezone(timedelta(hours=2)))
+    
+    expected = naive_utc.replace(tzinfo=timezone.utc).timestamp()
+    assert algorithm._get_created_at_ts({'created_at': naive_utc}) == expected
+    assert algorithm._get_created_at_ts({'created_at': aware}) == expected
+
+
+def test_prompt_category_leaves_prompt_untouched_and_follows_edits():
+    algorithm = FeedAlgorithm()
+    prompt = _prompt('p', 'creator', "Write a story about data")
+    
+    assert algorithm._get_prompt_category(prompt) == 'creative'
+    assert '_category' not in prompt
+    prompt['template'] = "Review this startup code"
+    assert algorithm._get_prompt_category(prompt) == 'business'
+
+
+def test_interaction_log_grows_and_histograms_by_utc_hour():
+    log = InteractionLog(capacity=2)
+    day = datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()
+    events = [(i % 3, day + 3600 * (i % 5) + 59 * i, i % len(INTERACTION_TYPES)) for i in range(37)]
+    for event in events:
+        log.append(*event)
+        
+    assert len(log) == 37
+    assert log.prompt_idx[:37].tolist() == [e[0] for e in events]  # Survived every doubling
+    expected_hours = [0] * 24
+    for _, timestamp, _ in events:
+        expected_hours[datetime.fromtimestamp(timestamp, timezone.utc).hour] += 1
+    assert log.hourly_histogram().tolist() == expected_hours
+    assert log.count('remix') == sum(1 for e in events if e[2] == INTERACTION_TYPE_IDS['remix'])
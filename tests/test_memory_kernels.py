@@ -0,0 +1,22 @@
+import numpy as np
+
+from core.memory import _kernels
+
+
+def _sequential_ema(arr, idx, vals, alpha):
+    keep = np.float32(1.0) - alpha
+    for i, v in zip(idx, vals):
+        arr[i] = arr[i] * keep + v * alpha
+
+
+def test_ema_update_blends_repeated_indices_in_order():
+    idx = np.array([2, 0, 2, 1, 2, 0], dtype=np.intp)
+    vals = np.array([1.0, 0.5, 0.0, 1.0, 1.0, 0.25], dtype=np.float32)
+    alpha = np.float32(0.2)
+    
+    expected = np.full(4, 0.5, dtype=np.float32)
+    _sequential_ema(expected, idx, vals, alpha)
+    arr = np.full(4, 0.5, dtype=np.float32)
+    _kernels.ema_update(arr, idx, vals, alpha)
+    
+    np.testing.assert_allclose(arr, expected, rtol=1e-6)
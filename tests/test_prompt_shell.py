@@ -0,0 +1,49 @@
+import pytest
+
+from core.engine.prompt_shell import HIST_CAP, HISTORY_FIELDS, ExecutionMetrics, HyperLogLog, PromptShell
+
+
+def test_template_reassignment_rerenders():
+    shell = PromptShell(creator_id="creator", template="Hello {name}")
+    shell.template = "Bye {name}"
+    
+    result = shell.execute({'name': 'Ada'}, user_id="user")
+    
+    assert result['result']['response'] == "Executed: Bye Ada"
+
+
+def test_unique_user_estimate_ignores_duplicates():
+    sketch = HyperLogLog()
+    for i in range(1000):
+        sketch.add(f"user_{i}")
+        sketch.add(f"user_{i}")
+        
+    assert abs(len(sketch) - 1000) < 50
+
+
+@pytest.mark.parametrize('count', [0, 1, HIST_CAP - 1, HIST_CAP, HIST_CAP + 1, 2 * HIST_CAP + 10])
+def test_recent_metrics_returns_newest_executions_oldest_first(count):
+    shell = PromptShell(creator_id="creator")
+    for i in range(count):
+        shell._record_history(ExecutionMetrics(completion_time=float(i), interaction_depth=i % 7))
+        
+    recent = shell.recent_metrics()
+    
+    kept = range(max(0, count - HIST_CAP), count)
+    assert recent.shape == (len(kept), len(HISTORY_FIELDS))
+    assert recent[:, HISTORY_FIELDS.index('completion_time')].tolist() == list(kept)
+    assert recent[:, HISTORY_FIELDS.index('interaction_depth')].tolist() == [i % 7 for i in kept]
+
+
+@pytest.mark.parametrize('response', [
+    "",
+    "Plain answer.",
+    "However, although it works, however you look at it...",
+    "Considering everything, alternatively, however, although" * 3,
+    "x" * 2000
+])
+def test_cognitive_load_counts_each_indicator_once(response):
+    indicators = ('however', 'although', 'considering', 'alternatively')
+    expected = min(len(response) / 1000 + sum(ind in response for ind in indicators) * 0.1, 1.0)
+    
+    assert PromptShell(creator_id="creator")._estimate_cognitive_load({'response': response}) == pytest.approx(expected)
@@ -0,0 +1,124 @@
+import random
+
+import pytest
+
+from core.memory import recursive_shell
+from core.memory.recursive_shell import RecursiveMemoryShell
+
+
+def _interactions(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            'context': {
+                'role': rng.choice(['expert', 'mentor', 'critic']),
+                'task': rng.choice(['design', 'review'])
+            },
+            'result': {
+                'success': rng.random(),
+                'response': 'x' * rng.randrange(400),
+                'execution_time': rng.random() * 3
+            },
+            'user_id': f"user_{rng.randrange(8)}"
+        }
+        for _ in range(count)
+    ]
+
+
+def _state(shell):
+    state = shell.get_memory_state()
+    del state['created_at'], state['last_deepened_at']
+    return state, shell.mutation_rate, sorted(shell.memory_layers[-1].learned_patterns.items())
+
+
+@pytest.mark.parametrize('count', [1, 15, 16, 21, 150])
+def test_remember_many_matches_remember_in_sequence(count):
+    interactions = _interactions(count)
+    one_by_one = RecursiveMemoryShell("prompt", "As a {role}, help me {task}")
+    for interaction in interactions:
+        expected = one_by_one.remember(interaction)
+    batched = RecursiveMemoryShell("prompt", "As a {role}, help me {task}")
+    
+    response = batched.remember_many(interactions)
+    
+    assert response == expected
+    assert _state(batched) == _state(one_by_one)
+
+
+def test_user_adaptations_evict_least_recent_user_at_capacity(monkeypatch):
+    monkeypatch.setattr(recursive_shell, 'MAX_ADAPTED_USERS', 3)
+    shell = RecursiveMemoryShell("prompt", "template")
+    
+    for user_id in ("u1", "u2", "u3", "u1"):
+        shell.remember({'context': {}, 'result': {'success': 1.0}, 'user_id': user_id})
+    shell._create_new_layer()  # Later layers share the same LRU
+    shell.remember({'context': {}, 'result': {'success': 1.0}, 'user_id': "u4"})
+    
+    adaptations = shell.memory_layers[-1].user_adaptations
+    assert adaptations is shell.memory_layers[0].user_adaptations
+    assert list(adaptations) == ["u3", "u1", "u4"]  # u2 was least recently seen
+    assert adaptations["u1"]['success_rate'] == pytest.approx(0.19)
+
+
+@pytest.mark.parametrize('context', [
+    {'role': 'expert', 'task': 'design'},
+    {'task': 'design', 'role': 'a very long role name that gets clipped'},
+    {'role': 'expert', 'task': 3},
+    {'role': 'expert', 'tone': 'warm'},
+    {'role': 'expert'},
+    {}
+])
+def test_context_patterns_match_generic_extraction_after_schema_locks(context):
+    shell = RecursiveMemoryShell("prompt", "template")
+    shell._extract_context_patterns({'role': 'mentor', 'task': 'review'}, 0.5)  # Locks the schema
+    
+    expected = {
+        f"context_{key}_{value[:20]}": 0.9
+        for key, value in context.items() if isinstance(value, str)
+    }
+    assert shell._extract_context_patterns(context, 0.9) == expected
+
+
+def test_context_key_is_an_order_independent_fingerprint_of_scalars():
+    shell = RecursiveMemoryShell("prompt", "template")
+    key = shell._generate_context_key({'role': 'expert', 'turns': 3, 'notes': ['ignored']})
+    
+    assert isinstance(key, int)
+    assert key == shell._generate_context_key({'turns': 3, 'role': 'expert'})
+    assert key != shell._generate_context_key({'role': 'expert', 'turns': 4})
+    
+    shell.remember({'context': {'turns': 3, 'role': 'expert'}, 'result': {'success': 0.1}})
+    shell.remember({'context': {'role': 'expert', 'turns': 3}, 'result': {'success': 0.1}})
+    assert shell.behavioral_memory['failure_patterns'] == {key: 2}
+    assert list(shell.behavioral_memory['successful_contexts']) == [key]
+
+
+def test_evolution_history_keeps_the_newest_records(monkeypatch):
+    monkeypatch.setattr(recursive_shell, 'EVOLUTION_HISTORY_SIZE', 3)
+    shell = RecursiveMemoryShell("prompt", "template")
+    mutations = iter(f"template v{i}" for i in range(1, 6))
+    monkeypatch.setattr(shell, '_generate_template_mutation', lambda patterns: next(mutations))
+    
+    for _ in range(5):
+        shell._evolve_template()
+        
+    assert shell._evolution_count == 5
+    assert [record['generation'] for record in shell.evolution_history] == [3, 4, 5]
+    assert shell.evolution_history[-1]['old_template'] == "template v4"
+
+
+def test_closed_layers_keep_their_strongest_patterns():
+    shell = RecursiveMemoryShell("prompt", "template")
+    strong = {'context': {'role': 'expert'}, 'result': {'success': 1.0}}
+    for _ in range(10):
+        shell.remember(strong)
+    peak = shell.memory_layers[-1].learned_patterns.get('context_role_expert')
+    shell._create_new_layer()
+    
+    # The live store forgets the pattern, the retired snapshot does not
+    for _ in range(10):
+        shell.remember({'context': {'role': 'expert'}, 'result': {'success': 0.0}})
+    assert shell.memory_layers[-1].learned_patterns.get('context_role_expert') < 0.7
+    
+    assert ('context_role_expert', peak) in shell._retired_top
+    assert ('context_role_expert', peak) in shell._identify_successful_patterns()
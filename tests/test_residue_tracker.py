@@ -0,0 +1,121 @@
+import math
+import warnings
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from core.symbolic import residue_tracker
+from core.symbolic.residue_tracker import (
+    ResidueLibrary, ResiduePattern, SymbolicResidueTracker, _as_datetime64, _has_mirror, _nesting_depth
+)
+
+PROMPTS = [
+    {
+        'template': "You are a {role} who can discover {secret}. Simply {action}...",
+        'metrics': {'effectiveness_score': 0.9, 'viral_coefficient': 0.2},
+        'created_at': 1_700_000_000.0,
+        'usage_times': [1_700_000_000.0 + 600 * i for i in range(10)]
+    },
+    {
+        'template': "Why this? Why now? Why {you}?",
+        'metrics': {'effectiveness_score': 0.4},
+        'created_at': 1_700_040_000.0
+    },
+    {
+        'template': "A concept, an idea, and a way [optional]",
+        'metrics': {'effectiveness_score': 0.75, 'usage_count': 10, 'remix_count': 2},
+        'created_at': 1_700_080_000.0
+    }
+]
+
+
+def test_analyze_many_matches_analyze_prompt():
+    one_by_one = SymbolicResidueTracker()
+    expected = [one_by_one.analyze_prompt(prompt) for prompt in PROMPTS]
+    
+    analyses = SymbolicResidueTracker().analyze_many(PROMPTS)
+    
+    assert [a['total_residue'] for a in analyses] == [e['total_residue'] for e in expected]
+    assert SymbolicResidueTracker().analyze_many([]) == []
+
+
+def test_usage_times_accept_aware_datetimes():
+    aware = [datetime(2024, 1, 1, 10, tzinfo=timezone(timedelta(hours=2))) + timedelta(minutes=i) for i in range(5)]
+    
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        converted = _as_datetime64(aware)
+        
+    assert converted[0] == np.datetime64('2024-01-01T08:00:00')
+    assert (converted == _as_datetime64([t.timestamp() for t in aware])).all()
+
+
+def test_library_items_write_through():
+    library = ResidueLibrary()
+    library['hook'] = ResiduePattern(pattern_id='hook', pattern_type='semantic', strength=1.0)
+    
+    library['hook'].strength += 0.5
+    library['hook'].emergence_count += 1
+    for i in range(100):
+        library.reinforce(f"filler:{i}", 'semantic', strength_gain=1.0, viral_score=0.0)  # Regrows the arrays
+    library['hook'].decay(168)
+    
+    pattern = library['hook']
+    assert pattern.strength == pytest.approx(1.5 * math.exp(-1), rel=1e-6)
+    assert pattern.emergence_count == 1
+    assert pattern.pattern_type == 'semantic'
+
+
+@pytest.mark.parametrize('template', [
+    "left | left",
+    "intro\nsame thing | same thing",
+    "a | b | b",
+    "  echo  |echo"
+])
+def test_mirror_structure_detects_repeated_halves(template):
+    assert _has_mirror(template)
+
+
+@pytest.mark.parametrize('template', [
+    "no pipes here",
+    "left | right",
+    "abc | abcd",  # The backreference regex matched a shared prefix like this
+    " | ",
+    "same\n| same"  # Halves on different lines
+])
+def test_mirror_structure_rejects_non_mirrors(template):
+    assert not _has_mirror(template)
+
+
+def test_abstract_terms_match_whole_words_only():
+    tracker = SymbolicResidueTracker()
+    
+    # 'way' in 'always', 'thing' in 'something', 'idea' in 'ideal' no longer count
+    assert tracker._calculate_semantic_openness("always something ideal conceptual") == 0.0
+    assert tracker._calculate_semantic_openness("An Idea, a concept; any way") == pytest.approx(0.3)
+
+
+@pytest.mark.parametrize('template, depth', [
+    ("plain text", 0),
+    ("{a} and {b}", 1),
+    ("{outer [inner {core}]}", 3),
+    ("[a] {b [c]} [[d]]", 2),
+    ("}} ]{x}", 1),  # Stray closers never push depth below zero
+    ("{unclosed [still open", 2)
+])
+def test_nesting_depth_tracks_mixed_brackets(template, depth):
+    assert _nesting_depth(template) == depth
+    assert SymbolicResidueTracker()._detect_structural_patterns(template)['nested_depth'] == depth
+
+
+def test_pattern_combinations_evict_least_recently_seen(monkeypatch):
+    monkeypatch.setattr(residue_tracker, 'MAX_PATTERN_COMBINATIONS', 3)
+    tracker = SymbolicResidueTracker()
+    
+    for template in ("first", "second", "third", "first", "fourth"):
+        tracker._discover_novel_patterns(template, {})
+        
+    seen = [key[0] for key in tracker.pattern_combinations]
+    assert seen == ["third", "first", "fourth"]  # "second" was the stalest
+    assert tracker.pattern_combinations[("first", 0, 1, False)] == 2